@@ -155,16 +155,16 @@ def test_website_detector(window):
     
     for url in test_urls:
         result = detector.detect(url)
-        print(f"   {url[:40]:40} -> {result['category']:15} ({result['activity_type']})")
+        print(f"   {url[:40]:40} -> {result.category:15} ({result.activity_type})")
     
     # Test with actual window if browser
     if window and window.is_browser and window.url:
         print(f"\n   Current browser URL:")
         result = detector.detect(window.url, window.window_title)
         print(f"   {window.url[:50]}")
-        print(f"   Category: {result['category']}")
-        print(f"   Activity: {result['activity_type']}")
-        print(f"   Is NSFW: {result['is_nsfw']}")
+        print(f"   Category: {result.category}")
+        print(f"   Activity: {result.activity_type}")
+        print(f"   Is NSFW: {result.is_nsfw}")
     
     return True
 
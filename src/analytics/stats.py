@@ -71,33 +71,19 @@ class StatsCalculator:
         if cached:
             return cached
         
-        # Calculate from activities
+        # Calculate from activities (aggregated in SQL, no per-row objects)
         try:
-            start = datetime.strptime(date_str, "%Y-%m-%d")
-            end = start + timedelta(days=1)
-            
-            activities = self.db.get_activities(
-                start_time=start,
-                end_time=end,
-                limit=10000
-            )
+            totals = self.db.get_activity_type_totals(date_str)
             
-            if not activities:
+            if not totals:
                 return self._empty_summary(date_str)
             
             # Calculate aggregates
-            time_by_type = defaultdict(int)
-            total_duration = 0
-            total_confidence = 0
-            nsfw_count = 0
-            
-            for activity in activities:
-                duration = getattr(activity, 'duration', 30)
-                time_by_type[activity.activity_type] += duration
-                total_duration += duration
-                total_confidence += activity.confidence
-                if activity.is_nsfw:
-                    nsfw_count += 1
+            time_by_type = {row['activity_type']: row['total_time'] or 0 for row in totals}
+            total_duration = sum(time_by_type.values())
+            total_confidence = sum(row['confidence_sum'] or 0 for row in totals)
+            nsfw_count = sum(row['nsfw_count'] or 0 for row in totals)
+            total_sessions = sum(row['session_count'] for row in totals)
             
             # Calculate productivity score
             productivity_score = self._calculate_productivity_score(time_by_type, total_duration)
@@ -116,9 +102,9 @@ class StatsCalculator:
                 'neutral_time': time_by_type.get('neutral', 0),
                 'idle_time': time_by_type.get('idle', 0),
                 'productivity_score': productivity_score,
-                'total_sessions': len(activities),
+                'total_sessions': total_sessions,
                 'nsfw_detections': nsfw_count,
-                'avg_confidence': total_confidence / len(activities) if activities else 0,
+                'avg_confidence': total_confidence / total_sessions,
             }
             
             return summary
@@ -182,7 +168,7 @@ class StatsCalculator:
         start_date = end_date - timedelta(days=days)
         
         try:
-            activities = self.db.get_activities(
+            activities = self.db.iter_activities(
                 start_time=start_date,
                 end_time=end_date,
                 limit=50000
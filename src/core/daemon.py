@@ -16,8 +16,8 @@ from dataclasses import dataclass
 
 from .screenshot import ScreenshotCapture, get_screenshot_capture
 from .monitor import WindowMonitor, WindowInfo, get_window_monitor
-from ..storage.database import Database, get_database
-from ..storage.models import Activity, ActivityType
+from ..storage.database import Database, FlushBuffer, get_database
+from ..storage.models import Activity, ActivityType, EXTRACTED_TEXT_MAX_LENGTH
 from ..utils.config import get_config, Config
 from ..utils.logger import setup_logging, get_logger
 from ..utils.helpers import format_duration
@@ -82,6 +82,7 @@ class ContentTrackerDaemon:
         self.screenshot_capture: Optional[ScreenshotCapture] = None
         self.window_monitor: Optional[WindowMonitor] = None
         self.database: Optional[Database] = None
+        self._write_buffer: Optional[FlushBuffer] = None
         
         # Analysis components (will be initialized lazily)
         self._content_classifier = None
@@ -130,6 +131,11 @@ class ContentTrackerDaemon:
         
         # Initialize database
         self.database = get_database(self.config.database_path)
+        self._write_buffer = FlushBuffer(
+            self.database,
+            max_size=self.config.performance.write_batch_size,
+            flush_interval=self.config.performance.write_flush_interval
+        )
         
         # Initialize content classifier (lazy load)
         self._init_content_classifier()
@@ -232,12 +238,16 @@ class ContentTrackerDaemon:
         if self.window_monitor:
             self.window_monitor.close()
         
+        if self._write_buffer:
+            try:
+                self._write_buffer.close()
+            except Exception as e:
+                logger.error(f"Failed to flush buffered activities: {e}")
+        
         if self.database:
             # Update daily stats before closing
             try:
-                self.database.update_daily_stats()
-                self.database.update_app_usage()
-                self.database.update_website_usage()
+                self.database.update_summaries()
             except Exception as e:
                 logger.error(f"Failed to update stats: {e}")
             
@@ -331,30 +341,57 @@ class ContentTrackerDaemon:
             try:
                 # Get item from queue with timeout
                 try:
-                    item = self._analysis_queue.get(timeout=1)
+                    items = [self._analysis_queue.get(timeout=1)]
                 except queue.Empty:
+                    # Nothing captured (paused/idle): still honour the
+                    # time-based flush so rows don't sit unwritten
+                    if self._write_buffer.flush_if_due():
+                        self.database.optimize()
                     continue
                 
-                # Perform analysis
-                activity = self._analyze_content(
-                    item['window_info'],
-                    item['screenshot'],
-                    item['timestamp']
-                )
+                # Drain whatever else is already queued so the batch
+                # is written in a single transaction
+                while len(items) < self._analysis_queue.maxsize:
+                    try:
+                        items.append(self._analysis_queue.get_nowait())
+                    except queue.Empty:
+                        break
                 
-                if activity:
-                    # Store in database
-                    self.database.insert_activity(activity)
-                    self.state.total_analyses += 1
-                    self.state.last_analysis_time = datetime.now()
-                    
-                    # Trigger callback
-                    if self._on_activity_detected:
-                        self._on_activity_detected(activity)
+                try:
+                    # Perform analysis; one bad capture must not cost the
+                    # rest of the batch
+                    activities = []
+                    for item in items:
+                        try:
+                            activity = self._analyze_content(
+                                item['window_info'],
+                                item['screenshot'],
+                                item['timestamp']
+                            )
+                        except Exception as e:
+                            self.state.errors += 1
+                            logger.error(f"Analysis error: {e}", exc_info=True)
+                            continue
+                        if activity:
+                            activities.append(activity)
                     
-                    logger.debug(f"Activity recorded: {activity.content_description}")
-                
-                self._analysis_queue.task_done()
+                    if activities:
+                        # Buffer for a batched write
+                        for activity in activities:
+                            if self._write_buffer.add(activity):
+                                self.database.optimize()
+                        self.state.total_analyses += len(activities)
+                        self.state.last_analysis_time = datetime.now()
+                        
+                        for activity in activities:
+                            # Trigger callback
+                            if self._on_activity_detected:
+                                self._on_activity_detected(activity)
+                            
+                            logger.debug(f"Activity recorded: {activity.content_description}")
+                finally:
+                    for _ in items:
+                        self._analysis_queue.task_done()
                 
             except Exception as e:
                 self.state.errors += 1
@@ -409,7 +446,7 @@ class ContentTrackerDaemon:
                 activity.confidence = classification.get('confidence', 0.0)
                 activity.nsfw_score = classification.get('nsfw_score', 0.0)
                 activity.is_nsfw = classification.get('is_nsfw', False)
-                activity.extracted_text = classification.get('extracted_text', '')[:1000]
+                activity.extracted_text = classification.get('extracted_text', '')[:EXTRACTED_TEXT_MAX_LENGTH]
                 
             except Exception as e:
                 logger.error(f"Content classification failed: {e}")
@@ -517,7 +554,7 @@ class ContentTrackerDaemon:
             duration=self.config.monitoring.screenshot_interval
         )
         
-        self.database.insert_activity(activity)
+        self._write_buffer.add(activity)
         logger.debug("Recorded idle activity")
     
     def _extend_last_activity(self):
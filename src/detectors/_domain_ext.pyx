@@ -0,0 +1,56 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled domain extraction for the website detector.
+
+Optional: website_detector falls back to _py_extract_domain when this
+module is not built. Build it in place with:
+
+    cythonize -i src/detectors/_domain_ext.pyx
+"""
+
+from urllib.parse import urlparse
+
+
+cpdef str extract_domain(str url):
+    """Extract domain from URL (same rules as _py_extract_domain)."""
+    cdef Py_ssize_t length, start = 0, end, index
+    cdef Py_UCS4 char
+    cdef bint needs_parser = False
+    cdef str host
+
+    if not url:
+        return ""
+
+    length = len(url)
+    index = url.find('://')
+    if index >= 0:
+        start = index + 3
+
+    # Single scan for the end of the host and for userinfo / IPv6 markers
+    end = length
+    for index in range(start, length):
+        char = url[index]
+        if char == '/' or char == '?' or char == '#':
+            end = index
+            break
+        if char == '@' or char == '[':
+            needs_parser = True
+
+    host = url[start:end].lower()
+
+    if needs_parser:
+        try:
+            host = urlparse('https://' + host).hostname or ""
+        except ValueError:
+            return host
+    else:
+        # Remove port
+        index = host.find(':')
+        if index >= 0:
+            host = host[:index]
+
+    # Remove www.
+    if host.startswith('www.'):
+        host = host[4:]
+
+    return host
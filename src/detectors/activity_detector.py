@@ -127,7 +127,7 @@ class ActivityDetector:
         website_detection = self.website_detector.detect(url, window_title)
         
         # Check if it's a video site
-        if website_detection.get("is_video_site", False):
+        if website_detection.is_video_site:
             video_detection = self.video_detector.detect(window_title, url, ocr_text)
             
             activity_type = video_detection.get("activity_type", "entertainment")
@@ -142,13 +142,13 @@ class ActivityDetector:
                 is_productive=activity_type in ["educational", "productive"],
                 productivity_score=self.PRODUCTIVITY_WEIGHTS.get(activity_type, 0.0),
                 confidence=video_detection.get("confidence", 0.5),
-                is_nsfw=website_detection.get("is_nsfw", False)
+                is_nsfw=website_detection.is_nsfw
             )
         
         # Regular website
-        activity_type = website_detection.get("activity_type", "neutral")
-        category = website_detection.get("category", "browsing")
-        site_name = website_detection.get("name", website_detection.get("domain", "Website"))
+        activity_type = website_detection.activity_type
+        category = website_detection.category
+        site_name = website_detection.name
         
         # Generate description
         if activity_type == "productive":
@@ -170,8 +170,8 @@ class ActivityDetector:
             description=description,
             is_productive=activity_type in ["productive", "educational"],
             productivity_score=self.PRODUCTIVITY_WEIGHTS.get(activity_type, 0.0),
-            confidence=website_detection.get("confidence", 0.5),
-            is_nsfw=website_detection.get("is_nsfw", False)
+            confidence=website_detection.confidence,
+            is_nsfw=website_detection.is_nsfw
         )
     
     def _analyze_media_activity(
@@ -3,14 +3,161 @@ Website Detector - Detects and classifies websites.
 """
 
 import os
+import sys
 import json
 import re
 import logging
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, NamedTuple
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+try:
+    # Optional Aho-Corasick matcher for the adult keyword list
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+
+class WebsiteRule(NamedTuple):
+    """Classification of a website pattern."""
+    category: str
+    activity: str
+    name: str
+    nsfw: bool = False
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WebsiteRule':
+        """Create from a custom rules JSON entry."""
+        return cls(
+            category=data.get("category", "unknown"),
+            activity=data.get("activity", "neutral"),
+            name=data.get("name", ""),
+            nsfw=data.get("nsfw", False)
+        )
+
+
+# Common browser title patterns, in priority order
+TITLE_PATTERNS = {
+    "youtube": WebsiteRule("video_streaming", "entertainment", "YouTube"),
+    "github": WebsiteRule("development", "productive", "GitHub"),
+    "stack overflow": WebsiteRule("development", "productive", "Stack Overflow"),
+    "reddit": WebsiteRule("forum", "social_media", "Reddit"),
+    "twitter": WebsiteRule("social_media", "social_media", "Twitter"),
+    "facebook": WebsiteRule("social_media", "social_media", "Facebook"),
+    "instagram": WebsiteRule("social_media", "social_media", "Instagram"),
+    "linkedin": WebsiteRule("professional", "productive", "LinkedIn"),
+    "netflix": WebsiteRule("video_streaming", "entertainment", "Netflix"),
+    "amazon": WebsiteRule("shopping", "shopping", "Amazon"),
+    "gmail": WebsiteRule("email", "productive", "Gmail"),
+    "google docs": WebsiteRule("productivity", "productive", "Google Docs"),
+}
+
+# All title patterns as one alternation (one named group each), so the
+# title is scanned left to right once; priority is applied in Python
+_TITLE_INFO = {
+    re.sub(r'\W', '_', pattern): (priority, rule)
+    for priority, (pattern, rule) in enumerate(TITLE_PATTERNS.items())
+}
+_TITLE_REGEX = re.compile(
+    '|'.join(
+        f'(?P<{group}>{re.escape(pattern)})'
+        for group, pattern in zip(_TITLE_INFO, TITLE_PATTERNS)
+    ),
+    re.IGNORECASE
+)
+
+# Activity types and categories used to derive the boolean flags
+_PRODUCTIVE_ACTIVITIES = frozenset({"productive", "educational"})
+_DISTRACTING_ACTIVITIES = frozenset({"entertainment", "social_media", "gaming", "adult"})
+_VIDEO_CATEGORIES = frozenset({"video_streaming", "live_streaming", "anime_streaming"})
+_SOCIAL_CATEGORIES = frozenset({"social_media", "forum"})
+_EDUCATIONAL_CATEGORIES = frozenset({"learning", "documentation", "tech_blog"})
+
+# category -> (is_video_site, is_social_media, is_shopping, is_educational);
+# categories missing from the table have every flag unset
+_NO_FLAGS = (False, False, False, False)
+_CATEGORY_FLAGS = {
+    category: (
+        category in _VIDEO_CATEGORIES,
+        category in _SOCIAL_CATEGORIES,
+        category == "shopping",
+        category in _EDUCATIONAL_CATEGORIES,
+    )
+    for category in _VIDEO_CATEGORIES | _SOCIAL_CATEGORIES | {"shopping"} | _EDUCATIONAL_CATEGORIES
+}
+
+# slots=True is only accepted by dataclass on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class DetectionResult:
+    """Result of website detection."""
+    website: str = ""
+    domain: str = ""
+    category: str = "unknown"
+    activity_type: str = "neutral"
+    name: str = ""
+    is_nsfw: bool = False
+    is_video_site: bool = False
+    is_social_media: bool = False
+    is_shopping: bool = False
+    is_educational: bool = False
+    confidence: float = 0.5
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+def _py_extract_domain(url: str) -> str:
+    """Extract domain from URL."""
+    if not url:
+        return ""
+    
+    # Plain string scan; urlparse is only needed for the rare odd hosts
+    host = url.lower()
+    scheme_end = host.find('://')
+    if scheme_end >= 0:
+        host = host[scheme_end + 3:]
+    
+    end = len(host)
+    for separator in '/?#':
+        index = host.find(separator, 0, end)
+        if index >= 0:
+            end = index
+    host = host[:end]
+    
+    if '@' in host or '[' in host:
+        # Userinfo or IPv6 literal
+        try:
+            host = urlparse('https://' + host).hostname or ""
+        except ValueError:
+            return host
+    else:
+        # Remove port
+        colon = host.find(':')
+        if colon >= 0:
+            host = host[:colon]
+    
+    # Remove www.
+    if host.startswith('www.'):
+        host = host[4:]
+    
+    return host
+
+
+try:
+    # Optional compiled version, see _domain_ext.pyx
+    from ._domain_ext import extract_domain
+except ImportError:
+    extract_domain = _py_extract_domain
+
 
 class WebsiteDetector:
     """
@@ -18,166 +165,166 @@ class WebsiteDetector:
     """
     
     # Default website classifications
-    DEFAULT_WEBSITE_RULES = {
+    DEFAULT_WEBSITE_RULES = MappingProxyType({
         # Video Streaming
-        "youtube.com": {"category": "video_streaming", "activity": "entertainment", "name": "YouTube"},
-        "youtu.be": {"category": "video_streaming", "activity": "entertainment", "name": "YouTube"},
-        "netflix.com": {"category": "video_streaming", "activity": "entertainment", "name": "Netflix"},
-        "primevideo.com": {"category": "video_streaming", "activity": "entertainment", "name": "Prime Video"},
-        "amazon.com/prime": {"category": "video_streaming", "activity": "entertainment", "name": "Prime Video"},
-        "disneyplus.com": {"category": "video_streaming", "activity": "entertainment", "name": "Disney+"},
-        "hulu.com": {"category": "video_streaming", "activity": "entertainment", "name": "Hulu"},
-        "hbomax.com": {"category": "video_streaming", "activity": "entertainment", "name": "HBO Max"},
-        "max.com": {"category": "video_streaming", "activity": "entertainment", "name": "Max"},
-        "twitch.tv": {"category": "live_streaming", "activity": "entertainment", "name": "Twitch"},
-        "vimeo.com": {"category": "video_streaming", "activity": "neutral", "name": "Vimeo"},
-        "dailymotion.com": {"category": "video_streaming", "activity": "entertainment", "name": "Dailymotion"},
-        "crunchyroll.com": {"category": "anime_streaming", "activity": "entertainment", "name": "Crunchyroll"},
-        "funimation.com": {"category": "anime_streaming", "activity": "entertainment", "name": "Funimation"},
+        "youtube.com": WebsiteRule("video_streaming", "entertainment", "YouTube"),
+        "youtu.be": WebsiteRule("video_streaming", "entertainment", "YouTube"),
+        "netflix.com": WebsiteRule("video_streaming", "entertainment", "Netflix"),
+        "primevideo.com": WebsiteRule("video_streaming", "entertainment", "Prime Video"),
+        "amazon.com/prime": WebsiteRule("video_streaming", "entertainment", "Prime Video"),
+        "disneyplus.com": WebsiteRule("video_streaming", "entertainment", "Disney+"),
+        "hulu.com": WebsiteRule("video_streaming", "entertainment", "Hulu"),
+        "hbomax.com": WebsiteRule("video_streaming", "entertainment", "HBO Max"),
+        "max.com": WebsiteRule("video_streaming", "entertainment", "Max"),
+        "twitch.tv": WebsiteRule("live_streaming", "entertainment", "Twitch"),
+        "vimeo.com": WebsiteRule("video_streaming", "neutral", "Vimeo"),
+        "dailymotion.com": WebsiteRule("video_streaming", "entertainment", "Dailymotion"),
+        "crunchyroll.com": WebsiteRule("anime_streaming", "entertainment", "Crunchyroll"),
+        "funimation.com": WebsiteRule("anime_streaming", "entertainment", "Funimation"),
         
         # Social Media
-        "facebook.com": {"category": "social_media", "activity": "social_media", "name": "Facebook"},
-        "fb.com": {"category": "social_media", "activity": "social_media", "name": "Facebook"},
-        "instagram.com": {"category": "social_media", "activity": "social_media", "name": "Instagram"},
-        "twitter.com": {"category": "social_media", "activity": "social_media", "name": "Twitter"},
-        "x.com": {"category": "social_media", "activity": "social_media", "name": "X (Twitter)"},
-        "tiktok.com": {"category": "social_media", "activity": "social_media", "name": "TikTok"},
-        "snapchat.com": {"category": "social_media", "activity": "social_media", "name": "Snapchat"},
-        "pinterest.com": {"category": "social_media", "activity": "social_media", "name": "Pinterest"},
-        "tumblr.com": {"category": "social_media", "activity": "social_media", "name": "Tumblr"},
+        "facebook.com": WebsiteRule("social_media", "social_media", "Facebook"),
+        "fb.com": WebsiteRule("social_media", "social_media", "Facebook"),
+        "instagram.com": WebsiteRule("social_media", "social_media", "Instagram"),
+        "twitter.com": WebsiteRule("social_media", "social_media", "Twitter"),
+        "x.com": WebsiteRule("social_media", "social_media", "X (Twitter)"),
+        "tiktok.com": WebsiteRule("social_media", "social_media", "TikTok"),
+        "snapchat.com": WebsiteRule("social_media", "social_media", "Snapchat"),
+        "pinterest.com": WebsiteRule("social_media", "social_media", "Pinterest"),
+        "tumblr.com": WebsiteRule("social_media", "social_media", "Tumblr"),
         
         # Professional Networking
-        "linkedin.com": {"category": "professional", "activity": "productive", "name": "LinkedIn"},
+        "linkedin.com": WebsiteRule("professional", "productive", "LinkedIn"),
         
         # Reddit & Forums
-        "reddit.com": {"category": "forum", "activity": "social_media", "name": "Reddit"},
-        "old.reddit.com": {"category": "forum", "activity": "social_media", "name": "Reddit"},
-        "quora.com": {"category": "forum", "activity": "neutral", "name": "Quora"},
-        "news.ycombinator.com": {"category": "tech_forum", "activity": "educational", "name": "Hacker News"},
-        "slashdot.org": {"category": "tech_forum", "activity": "educational", "name": "Slashdot"},
+        "reddit.com": WebsiteRule("forum", "social_media", "Reddit"),
+        "old.reddit.com": WebsiteRule("forum", "social_media", "Reddit"),
+        "quora.com": WebsiteRule("forum", "neutral", "Quora"),
+        "news.ycombinator.com": WebsiteRule("tech_forum", "educational", "Hacker News"),
+        "slashdot.org": WebsiteRule("tech_forum", "educational", "Slashdot"),
         
         # Development & Coding
-        "github.com": {"category": "development", "activity": "productive", "name": "GitHub"},
-        "gitlab.com": {"category": "development", "activity": "productive", "name": "GitLab"},
-        "bitbucket.org": {"category": "development", "activity": "productive", "name": "Bitbucket"},
-        "stackoverflow.com": {"category": "development", "activity": "productive", "name": "Stack Overflow"},
-        "stackexchange.com": {"category": "development", "activity": "productive", "name": "Stack Exchange"},
-        "developer.mozilla.org": {"category": "documentation", "activity": "educational", "name": "MDN"},
-        "devdocs.io": {"category": "documentation", "activity": "educational", "name": "DevDocs"},
-        "docs.python.org": {"category": "documentation", "activity": "educational", "name": "Python Docs"},
-        "docs.microsoft.com": {"category": "documentation", "activity": "educational", "name": "Microsoft Docs"},
-        "learn.microsoft.com": {"category": "documentation", "activity": "educational", "name": "Microsoft Learn"},
-        "npmjs.com": {"category": "development", "activity": "productive", "name": "npm"},
-        "pypi.org": {"category": "development", "activity": "productive", "name": "PyPI"},
-        "crates.io": {"category": "development", "activity": "productive", "name": "crates.io"},
-        "hub.docker.com": {"category": "development", "activity": "productive", "name": "Docker Hub"},
-        "codepen.io": {"category": "development", "activity": "productive", "name": "CodePen"},
-        "jsfiddle.net": {"category": "development", "activity": "productive", "name": "JSFiddle"},
-        "replit.com": {"category": "development", "activity": "productive", "name": "Replit"},
-        "codesandbox.io": {"category": "development", "activity": "productive", "name": "CodeSandbox"},
+        "github.com": WebsiteRule("development", "productive", "GitHub"),
+        "gitlab.com": WebsiteRule("development", "productive", "GitLab"),
+        "bitbucket.org": WebsiteRule("development", "productive", "Bitbucket"),
+        "stackoverflow.com": WebsiteRule("development", "productive", "Stack Overflow"),
+        "stackexchange.com": WebsiteRule("development", "productive", "Stack Exchange"),
+        "developer.mozilla.org": WebsiteRule("documentation", "educational", "MDN"),
+        "devdocs.io": WebsiteRule("documentation", "educational", "DevDocs"),
+        "docs.python.org": WebsiteRule("documentation", "educational", "Python Docs"),
+        "docs.microsoft.com": WebsiteRule("documentation", "educational", "Microsoft Docs"),
+        "learn.microsoft.com": WebsiteRule("documentation", "educational", "Microsoft Learn"),
+        "npmjs.com": WebsiteRule("development", "productive", "npm"),
+        "pypi.org": WebsiteRule("development", "productive", "PyPI"),
+        "crates.io": WebsiteRule("development", "productive", "crates.io"),
+        "hub.docker.com": WebsiteRule("development", "productive", "Docker Hub"),
+        "codepen.io": WebsiteRule("development", "productive", "CodePen"),
+        "jsfiddle.net": WebsiteRule("development", "productive", "JSFiddle"),
+        "replit.com": WebsiteRule("development", "productive", "Replit"),
+        "codesandbox.io": WebsiteRule("development", "productive", "CodeSandbox"),
         
         # Learning Platforms
-        "udemy.com": {"category": "learning", "activity": "educational", "name": "Udemy"},
-        "coursera.org": {"category": "learning", "activity": "educational", "name": "Coursera"},
-        "edx.org": {"category": "learning", "activity": "educational", "name": "edX"},
-        "khanacademy.org": {"category": "learning", "activity": "educational", "name": "Khan Academy"},
-        "pluralsight.com": {"category": "learning", "activity": "educational", "name": "Pluralsight"},
-        "skillshare.com": {"category": "learning", "activity": "educational", "name": "Skillshare"},
-        "linkedin.com/learning": {"category": "learning", "activity": "educational", "name": "LinkedIn Learning"},
-        "codecademy.com": {"category": "learning", "activity": "educational", "name": "Codecademy"},
-        "freecodecamp.org": {"category": "learning", "activity": "educational", "name": "freeCodeCamp"},
-        "leetcode.com": {"category": "learning", "activity": "educational", "name": "LeetCode"},
-        "hackerrank.com": {"category": "learning", "activity": "educational", "name": "HackerRank"},
-        "codewars.com": {"category": "learning", "activity": "educational", "name": "Codewars"},
+        "udemy.com": WebsiteRule("learning", "educational", "Udemy"),
+        "coursera.org": WebsiteRule("learning", "educational", "Coursera"),
+        "edx.org": WebsiteRule("learning", "educational", "edX"),
+        "khanacademy.org": WebsiteRule("learning", "educational", "Khan Academy"),
+        "pluralsight.com": WebsiteRule("learning", "educational", "Pluralsight"),
+        "skillshare.com": WebsiteRule("learning", "educational", "Skillshare"),
+        "linkedin.com/learning": WebsiteRule("learning", "educational", "LinkedIn Learning"),
+        "codecademy.com": WebsiteRule("learning", "educational", "Codecademy"),
+        "freecodecamp.org": WebsiteRule("learning", "educational", "freeCodeCamp"),
+        "leetcode.com": WebsiteRule("learning", "educational", "LeetCode"),
+        "hackerrank.com": WebsiteRule("learning", "educational", "HackerRank"),
+        "codewars.com": WebsiteRule("learning", "educational", "Codewars"),
         
         # Tech News & Blogs
-        "medium.com": {"category": "blog", "activity": "neutral", "name": "Medium"},
-        "dev.to": {"category": "tech_blog", "activity": "educational", "name": "DEV Community"},
-        "hashnode.com": {"category": "tech_blog", "activity": "educational", "name": "Hashnode"},
-        "techcrunch.com": {"category": "tech_news", "activity": "news", "name": "TechCrunch"},
-        "theverge.com": {"category": "tech_news", "activity": "news", "name": "The Verge"},
-        "arstechnica.com": {"category": "tech_news", "activity": "news", "name": "Ars Technica"},
-        "wired.com": {"category": "tech_news", "activity": "news", "name": "Wired"},
+        "medium.com": WebsiteRule("blog", "neutral", "Medium"),
+        "dev.to": WebsiteRule("tech_blog", "educational", "DEV Community"),
+        "hashnode.com": WebsiteRule("tech_blog", "educational", "Hashnode"),
+        "techcrunch.com": WebsiteRule("tech_news", "news", "TechCrunch"),
+        "theverge.com": WebsiteRule("tech_news", "news", "The Verge"),
+        "arstechnica.com": WebsiteRule("tech_news", "news", "Ars Technica"),
+        "wired.com": WebsiteRule("tech_news", "news", "Wired"),
         
         # News Sites
-        "bbc.com": {"category": "news", "activity": "news", "name": "BBC"},
-        "cnn.com": {"category": "news", "activity": "news", "name": "CNN"},
-        "nytimes.com": {"category": "news", "activity": "news", "name": "NY Times"},
-        "theguardian.com": {"category": "news", "activity": "news", "name": "The Guardian"},
-        "reuters.com": {"category": "news", "activity": "news", "name": "Reuters"},
-        "apnews.com": {"category": "news", "activity": "news", "name": "AP News"},
-        "news.google.com": {"category": "news", "activity": "news", "name": "Google News"},
+        "bbc.com": WebsiteRule("news", "news", "BBC"),
+        "cnn.com": WebsiteRule("news", "news", "CNN"),
+        "nytimes.com": WebsiteRule("news", "news", "NY Times"),
+        "theguardian.com": WebsiteRule("news", "news", "The Guardian"),
+        "reuters.com": WebsiteRule("news", "news", "Reuters"),
+        "apnews.com": WebsiteRule("news", "news", "AP News"),
+        "news.google.com": WebsiteRule("news", "news", "Google News"),
         
         # Shopping
-        "amazon.com": {"category": "shopping", "activity": "shopping", "name": "Amazon"},
-        "amazon.co.uk": {"category": "shopping", "activity": "shopping", "name": "Amazon UK"},
-        "ebay.com": {"category": "shopping", "activity": "shopping", "name": "eBay"},
-        "aliexpress.com": {"category": "shopping", "activity": "shopping", "name": "AliExpress"},
-        "walmart.com": {"category": "shopping", "activity": "shopping", "name": "Walmart"},
-        "target.com": {"category": "shopping", "activity": "shopping", "name": "Target"},
-        "etsy.com": {"category": "shopping", "activity": "shopping", "name": "Etsy"},
+        "amazon.com": WebsiteRule("shopping", "shopping", "Amazon"),
+        "amazon.co.uk": WebsiteRule("shopping", "shopping", "Amazon UK"),
+        "ebay.com": WebsiteRule("shopping", "shopping", "eBay"),
+        "aliexpress.com": WebsiteRule("shopping", "shopping", "AliExpress"),
+        "walmart.com": WebsiteRule("shopping", "shopping", "Walmart"),
+        "target.com": WebsiteRule("shopping", "shopping", "Target"),
+        "etsy.com": WebsiteRule("shopping", "shopping", "Etsy"),
         
         # Music
-        "spotify.com": {"category": "music", "activity": "entertainment", "name": "Spotify"},
-        "open.spotify.com": {"category": "music", "activity": "entertainment", "name": "Spotify"},
-        "music.apple.com": {"category": "music", "activity": "entertainment", "name": "Apple Music"},
-        "soundcloud.com": {"category": "music", "activity": "entertainment", "name": "SoundCloud"},
-        "pandora.com": {"category": "music", "activity": "entertainment", "name": "Pandora"},
-        "deezer.com": {"category": "music", "activity": "entertainment", "name": "Deezer"},
-        "bandcamp.com": {"category": "music", "activity": "entertainment", "name": "Bandcamp"},
+        "spotify.com": WebsiteRule("music", "entertainment", "Spotify"),
+        "open.spotify.com": WebsiteRule("music", "entertainment", "Spotify"),
+        "music.apple.com": WebsiteRule("music", "entertainment", "Apple Music"),
+        "soundcloud.com": WebsiteRule("music", "entertainment", "SoundCloud"),
+        "pandora.com": WebsiteRule("music", "entertainment", "Pandora"),
+        "deezer.com": WebsiteRule("music", "entertainment", "Deezer"),
+        "bandcamp.com": WebsiteRule("music", "entertainment", "Bandcamp"),
         
         # Productivity Tools
-        "notion.so": {"category": "productivity", "activity": "productive", "name": "Notion"},
-        "trello.com": {"category": "productivity", "activity": "productive", "name": "Trello"},
-        "asana.com": {"category": "productivity", "activity": "productive", "name": "Asana"},
-        "monday.com": {"category": "productivity", "activity": "productive", "name": "Monday"},
-        "airtable.com": {"category": "productivity", "activity": "productive", "name": "Airtable"},
-        "docs.google.com": {"category": "productivity", "activity": "productive", "name": "Google Docs"},
-        "sheets.google.com": {"category": "productivity", "activity": "productive", "name": "Google Sheets"},
-        "slides.google.com": {"category": "productivity", "activity": "productive", "name": "Google Slides"},
-        "drive.google.com": {"category": "cloud_storage", "activity": "productive", "name": "Google Drive"},
-        "dropbox.com": {"category": "cloud_storage", "activity": "productive", "name": "Dropbox"},
-        "onedrive.live.com": {"category": "cloud_storage", "activity": "productive", "name": "OneDrive"},
-        "figma.com": {"category": "design", "activity": "productive", "name": "Figma"},
-        "canva.com": {"category": "design", "activity": "productive", "name": "Canva"},
-        "miro.com": {"category": "collaboration", "activity": "productive", "name": "Miro"},
+        "notion.so": WebsiteRule("productivity", "productive", "Notion"),
+        "trello.com": WebsiteRule("productivity", "productive", "Trello"),
+        "asana.com": WebsiteRule("productivity", "productive", "Asana"),
+        "monday.com": WebsiteRule("productivity", "productive", "Monday"),
+        "airtable.com": WebsiteRule("productivity", "productive", "Airtable"),
+        "docs.google.com": WebsiteRule("productivity", "productive", "Google Docs"),
+        "sheets.google.com": WebsiteRule("productivity", "productive", "Google Sheets"),
+        "slides.google.com": WebsiteRule("productivity", "productive", "Google Slides"),
+        "drive.google.com": WebsiteRule("cloud_storage", "productive", "Google Drive"),
+        "dropbox.com": WebsiteRule("cloud_storage", "productive", "Dropbox"),
+        "onedrive.live.com": WebsiteRule("cloud_storage", "productive", "OneDrive"),
+        "figma.com": WebsiteRule("design", "productive", "Figma"),
+        "canva.com": WebsiteRule("design", "productive", "Canva"),
+        "miro.com": WebsiteRule("collaboration", "productive", "Miro"),
         
         # Email
-        "mail.google.com": {"category": "email", "activity": "productive", "name": "Gmail"},
-        "outlook.live.com": {"category": "email", "activity": "productive", "name": "Outlook"},
-        "outlook.office.com": {"category": "email", "activity": "productive", "name": "Outlook"},
-        "mail.yahoo.com": {"category": "email", "activity": "productive", "name": "Yahoo Mail"},
-        "protonmail.com": {"category": "email", "activity": "productive", "name": "ProtonMail"},
-        "proton.me": {"category": "email", "activity": "productive", "name": "Proton Mail"},
+        "mail.google.com": WebsiteRule("email", "productive", "Gmail"),
+        "outlook.live.com": WebsiteRule("email", "productive", "Outlook"),
+        "outlook.office.com": WebsiteRule("email", "productive", "Outlook"),
+        "mail.yahoo.com": WebsiteRule("email", "productive", "Yahoo Mail"),
+        "protonmail.com": WebsiteRule("email", "productive", "ProtonMail"),
+        "proton.me": WebsiteRule("email", "productive", "Proton Mail"),
         
         # Search Engines
-        "google.com": {"category": "search", "activity": "neutral", "name": "Google"},
-        "bing.com": {"category": "search", "activity": "neutral", "name": "Bing"},
-        "duckduckgo.com": {"category": "search", "activity": "neutral", "name": "DuckDuckGo"},
+        "google.com": WebsiteRule("search", "neutral", "Google"),
+        "bing.com": WebsiteRule("search", "neutral", "Bing"),
+        "duckduckgo.com": WebsiteRule("search", "neutral", "DuckDuckGo"),
         
         # Gaming
-        "store.steampowered.com": {"category": "gaming", "activity": "gaming", "name": "Steam Store"},
-        "epicgames.com": {"category": "gaming", "activity": "gaming", "name": "Epic Games"},
-        "gog.com": {"category": "gaming", "activity": "gaming", "name": "GOG"},
-        "itch.io": {"category": "gaming", "activity": "gaming", "name": "itch.io"},
+        "store.steampowered.com": WebsiteRule("gaming", "gaming", "Steam Store"),
+        "epicgames.com": WebsiteRule("gaming", "gaming", "Epic Games"),
+        "gog.com": WebsiteRule("gaming", "gaming", "GOG"),
+        "itch.io": WebsiteRule("gaming", "gaming", "itch.io"),
         
         # AI Tools
-        "chat.openai.com": {"category": "ai_tool", "activity": "productive", "name": "ChatGPT"},
-        "openai.com": {"category": "ai_tool", "activity": "productive", "name": "OpenAI"},
-        "claude.ai": {"category": "ai_tool", "activity": "productive", "name": "Claude"},
-        "bard.google.com": {"category": "ai_tool", "activity": "productive", "name": "Google Bard"},
-        "gemini.google.com": {"category": "ai_tool", "activity": "productive", "name": "Google Gemini"},
-        "copilot.github.com": {"category": "ai_tool", "activity": "productive", "name": "GitHub Copilot"},
-        "midjourney.com": {"category": "ai_tool", "activity": "productive", "name": "Midjourney"},
-        "huggingface.co": {"category": "ai_tool", "activity": "productive", "name": "Hugging Face"},
+        "chat.openai.com": WebsiteRule("ai_tool", "productive", "ChatGPT"),
+        "openai.com": WebsiteRule("ai_tool", "productive", "OpenAI"),
+        "claude.ai": WebsiteRule("ai_tool", "productive", "Claude"),
+        "bard.google.com": WebsiteRule("ai_tool", "productive", "Google Bard"),
+        "gemini.google.com": WebsiteRule("ai_tool", "productive", "Google Gemini"),
+        "copilot.github.com": WebsiteRule("ai_tool", "productive", "GitHub Copilot"),
+        "midjourney.com": WebsiteRule("ai_tool", "productive", "Midjourney"),
+        "huggingface.co": WebsiteRule("ai_tool", "productive", "Hugging Face"),
         
         # Adult Content (generic patterns)
-        "pornhub.com": {"category": "adult", "activity": "adult", "name": "Adult Site", "nsfw": True},
-        "xvideos.com": {"category": "adult", "activity": "adult", "name": "Adult Site", "nsfw": True},
-        "xnxx.com": {"category": "adult", "activity": "adult", "name": "Adult Site", "nsfw": True},
-        "xhamster.com": {"category": "adult", "activity": "adult", "name": "Adult Site", "nsfw": True},
-        "redtube.com": {"category": "adult", "activity": "adult", "name": "Adult Site", "nsfw": True},
-    }
+        "pornhub.com": WebsiteRule("adult", "adult", "Adult Site", nsfw=True),
+        "xvideos.com": WebsiteRule("adult", "adult", "Adult Site", nsfw=True),
+        "xnxx.com": WebsiteRule("adult", "adult", "Adult Site", nsfw=True),
+        "xhamster.com": WebsiteRule("adult", "adult", "Adult Site", nsfw=True),
+        "redtube.com": WebsiteRule("adult", "adult", "Adult Site", nsfw=True),
+    })
     
     # Patterns for detecting adult content
     ADULT_PATTERNS = [
@@ -185,6 +332,14 @@ class WebsiteDetector:
         r'nude', r'naked', r'sex', r'hentai'
     ]
     
+    # Max number of memoized (url, window_title) classifications
+    CACHE_SIZE = 2048
+    
+    # Compiled adult patterns, shared by all instances (see _ensure_compiled)
+    adult_regex = None
+    _adult_search = None
+    _adult_automaton = None
+    
     def __init__(self, rules_path: str = None):
         """
         Initialize website detector.
@@ -192,22 +347,75 @@ class WebsiteDetector:
         Args:
             rules_path: Path to custom rules JSON file
         """
-        self.rules = self.DEFAULT_WEBSITE_RULES.copy()
+        self._ensure_compiled()
         
-        # Compile adult patterns
-        self.adult_regex = re.compile('|'.join(self.ADULT_PATTERNS), re.IGNORECASE)
+        # Shared read-only defaults; replaced by a merged dict if custom rules load
+        self.rules = self.DEFAULT_WEBSITE_RULES
+        
+        # Memoize classification per instance; the same tabs are polled repeatedly.
+        # Results are frozen, so cached instances are shared with callers.
+        self._detect_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._classify)
         
         # Load custom rules if provided
-        if rules_path and os.path.exists(rules_path):
-            try:
-                with open(rules_path, 'r') as f:
-                    custom_rules = json.load(f)
-                self.rules.update(custom_rules)
-                logger.info(f"Loaded {len(custom_rules)} custom website rules")
-            except Exception as e:
-                logger.error(f"Failed to load custom website rules: {e}")
+        if rules_path:
+            self.load_custom_rules(rules_path)
+    
+    @classmethod
+    def _ensure_compiled(cls):
+        """Compile the instance-independent matchers once per class."""
+        if cls.__dict__.get('adult_regex') is None:
+            cls.adult_regex = re.compile('|'.join(cls.ADULT_PATTERNS), re.IGNORECASE)
+            cls._adult_search = cls.adult_regex.search
+            
+            if HAS_AHOCORASICK:
+                # The patterns are plain keywords apart from escapes like '18\+'
+                automaton = ahocorasick.Automaton()
+                for pattern in cls.ADULT_PATTERNS:
+                    keyword = re.sub(r'\\(.)', r'\1', pattern).lower()
+                    automaton.add_word(keyword, keyword)
+                automaton.make_automaton()
+                cls._adult_automaton = automaton
     
-    def detect(self, url: str, window_title: str = "") -> Dict[str, Any]:
+    def load_custom_rules(self, rules_path: str) -> bool:
+        """
+        Load custom website rules on top of the current ones.
+        
+        Args:
+            rules_path: Path to custom rules JSON file
+            
+        Returns:
+            True if rules were loaded
+        """
+        if not os.path.exists(rules_path):
+            return False
+        
+        try:
+            with open(rules_path, 'r') as f:
+                custom_rules = json.load(f)
+            self.rules = {
+                **self.rules,
+                **{
+                    pattern: WebsiteRule.from_dict(info)
+                    for pattern, info in custom_rules.items()
+                    if isinstance(info, dict)
+                }
+            }
+            self.clear_cache()
+            logger.info(f"Loaded {len(custom_rules)} custom website rules")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to load custom website rules: {e}")
+            return False
+    
+    def clear_cache(self):
+        """Drop memoized detection results."""
+        self._detect_cached.cache_clear()
+    
+    def cache_info(self):
+        """Get hit/miss statistics of the detection cache."""
+        return self._detect_cached.cache_info()
+    
+    def detect(self, url: str, window_title: str = "") -> DetectionResult:
         """
         Detect and classify a website.
         
@@ -216,129 +424,108 @@ class WebsiteDetector:
             window_title: Browser window title
             
         Returns:
-            Dict with detection results
+            DetectionResult with detection results
         """
-        result = {
-            "website": "",
-            "domain": "",
-            "category": "unknown",
-            "activity_type": "neutral",
-            "name": "",
-            "is_nsfw": False,
-            "is_video_site": False,
-            "is_social_media": False,
-            "is_shopping": False,
-            "is_educational": False,
-            "confidence": 0.5
-        }
-        
+        return self._detect_cached(url or "", window_title or "")
+    
+    def _classify(self, url: str, window_title: str) -> DetectionResult:
+        """Classify a website (uncached)."""
         if not url and not window_title:
-            return result
+            return DetectionResult()
+        
+        # Normalize once; helpers below expect lowercase input
+        url_lower = url.lower()
+        title_lower = window_title.lower()
         
         # Extract domain from URL
         domain = self._extract_domain(url)
-        result["domain"] = domain
-        result["website"] = domain
+        
+        category = "unknown"
+        activity_type = "neutral"
+        name = ""
+        is_nsfw = False
+        confidence = 0.5
         
         # Try to match domain against rules
         matched = False
-        for pattern, info in self.rules.items():
-            if pattern in domain or pattern in url.lower():
-                result["category"] = info.get("category", "unknown")
-                result["activity_type"] = info.get("activity", "neutral")
-                result["name"] = info.get("name", domain)
-                result["is_nsfw"] = info.get("nsfw", False)
-                result["confidence"] = 0.9
+        for pattern, rule in self.rules.items():
+            if pattern in domain or pattern in url_lower:
+                category, activity_type, name, is_nsfw = rule
+                name = name or domain
+                confidence = 0.9
                 matched = True
                 break
         
         # If no match, try to detect from window title
         if not matched and window_title:
-            result = self._detect_from_title(result, window_title)
+            rule = self._detect_from_title(title_lower)
+            if rule:
+                category, activity_type, name, _ = rule
+                confidence = 0.7
         
         # Check for adult content patterns
-        if not result["is_nsfw"]:
-            result["is_nsfw"] = self._check_adult_content(url, window_title, domain)
+        if not is_nsfw:
+            is_nsfw = self._check_adult_content(url_lower, title_lower, domain)
         
         # Set boolean flags
-        result["is_video_site"] = result["category"] in ["video_streaming", "live_streaming", "anime_streaming"]
-        result["is_social_media"] = result["category"] in ["social_media", "forum"]
-        result["is_shopping"] = result["category"] == "shopping"
-        result["is_educational"] = result["category"] in ["learning", "documentation", "tech_blog"]
+        is_video_site, is_social_media, is_shopping, is_educational = _CATEGORY_FLAGS.get(category, _NO_FLAGS)
         
-        return result
+        return DetectionResult(
+            website=domain,
+            domain=domain,
+            category=category,
+            activity_type=activity_type,
+            name=name,
+            is_nsfw=is_nsfw,
+            is_video_site=is_video_site,
+            is_social_media=is_social_media,
+            is_shopping=is_shopping,
+            is_educational=is_educational,
+            confidence=confidence
+        )
     
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL."""
-        if not url:
-            return ""
-        
-        # Add scheme if missing
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            
-            # Remove www.
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            
-            # Remove port
-            if ':' in domain:
-                domain = domain.split(':')[0]
-            
-            return domain
-        except Exception:
-            return url.lower()
+        return extract_domain(url)
     
-    def _detect_from_title(self, result: Dict, title: str) -> Dict:
+    def _detect_from_title(self, title: str) -> Optional[WebsiteRule]:
         """Try to detect website from browser title."""
-        title_lower = title.lower()
-        
-        # Common title patterns
-        title_patterns = {
-            "youtube": {"category": "video_streaming", "activity": "entertainment", "name": "YouTube"},
-            "github": {"category": "development", "activity": "productive", "name": "GitHub"},
-            "stack overflow": {"category": "development", "activity": "productive", "name": "Stack Overflow"},
-            "reddit": {"category": "forum", "activity": "social_media", "name": "Reddit"},
-            "twitter": {"category": "social_media", "activity": "social_media", "name": "Twitter"},
-            "facebook": {"category": "social_media", "activity": "social_media", "name": "Facebook"},
-            "instagram": {"category": "social_media", "activity": "social_media", "name": "Instagram"},
-            "linkedin": {"category": "professional", "activity": "productive", "name": "LinkedIn"},
-            "netflix": {"category": "video_streaming", "activity": "entertainment", "name": "Netflix"},
-            "amazon": {"category": "shopping", "activity": "shopping", "name": "Amazon"},
-            "gmail": {"category": "email", "activity": "productive", "name": "Gmail"},
-            "google docs": {"category": "productivity", "activity": "productive", "name": "Google Docs"},
-        }
-        
-        for pattern, info in title_patterns.items():
-            if pattern in title_lower:
-                result["category"] = info["category"]
-                result["activity_type"] = info["activity"]
-                result["name"] = info["name"]
-                result["confidence"] = 0.7
-                break
-        
-        return result
+        # Earliest entry in TITLE_PATTERNS wins, wherever it occurs. Resume
+        # one character after each hit so overlapping patterns are seen.
+        best = None
+        search = _TITLE_REGEX.search
+        match = search(title)
+        while match:
+            priority, rule = _TITLE_INFO[match.lastgroup]
+            if best is None or priority < best[0]:
+                best = (priority, rule)
+                if priority == 0:
+                    break
+            match = search(title, match.start() + 1)
+        return best[1] if best else None
     
     def _check_adult_content(self, url: str, title: str, domain: str) -> bool:
-        """Check if content appears to be adult/NSFW."""
-        combined = f"{url} {title} {domain}".lower()
-        return bool(self.adult_regex.search(combined))
+        """Check if content appears to be adult/NSFW (expects lowercase input)."""
+        # No pattern spans the separator of the old "url title domain"
+        # string, so each part is checked on its own
+        automaton = self._adult_automaton
+        if automaton is not None:
+            for text in (url, title, domain):
+                for _ in automaton.iter(text):
+                    return True
+            return False
+        
+        search = self._adult_search
+        return bool(search(url) or search(title) or search(domain))
     
     def is_productive_site(self, url: str) -> bool:
         """Quick check if website is considered productive."""
-        detection = self.detect(url)
-        return detection["activity_type"] in ["productive", "educational"]
+        return self.detect(url).activity_type in _PRODUCTIVE_ACTIVITIES
     
     def is_distracting_site(self, url: str) -> bool:
         """Quick check if website is considered distracting."""
-        detection = self.detect(url)
-        return detection["activity_type"] in ["entertainment", "social_media", "gaming", "adult"]
+        return self.detect(url).activity_type in _DISTRACTING_ACTIVITIES
     
     def get_website_category(self, url: str) -> str:
         """Get category for a website."""
-        detection = self.detect(url)
-        return detection["category"]
+        return self.detect(url).category
@@ -2,6 +2,8 @@
 Module for testing notification functionality directly.
 """
 
+from .notifier import send_notification
+
 if __name__ == "__main__":
     # Test notification
     sent = send_notification(
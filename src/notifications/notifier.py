@@ -4,6 +4,7 @@ Desktop Notifier - Sends desktop notifications for events.
 
 import time
 import logging
+import threading
 from typing import Dict, Any, Optional
 import os
 
@@ -11,8 +12,7 @@ logger = logging.getLogger(__name__)
 
 try:
     # Try to import notify-py (modern notifications)
-    import notify
-    import notify
+    from notifypy import Notify
     HAS_NOTIFYPY = True
 except ImportError:
     HAS_NOTIFYPY = False
@@ -20,10 +20,29 @@ except ImportError:
 try:
     # Try to import py-notifier (simpler API)
     from notifier import Notifier
+    _py_notifier = Notifier()
     HAS_NOTIFIER = True
 except ImportError:
     HAS_NOTIFIER = False
 
+# Seconds of non-productive activity before a distraction notification
+_DISTRACTION_THRESHOLD_SEC = 1800  # 30 minutes
+
+# notify-py instance, created on first use and reused afterwards
+_cached_notifier = None
+_default_icon = None
+_notifier_lock = threading.Lock()
+
+
+def _get_notifier():
+    """Get the shared notify-py instance."""
+    global _cached_notifier, _default_icon
+    if _cached_notifier is None:
+        _cached_notifier = Notify(default_notification_application_name='ContentTracker')
+        _default_icon = _cached_notifier.icon
+    return _cached_notifier
+
+
 def send_notification(
     title: str,
     message: str,
@@ -37,7 +56,7 @@ def send_notification(
         title: Notification title
         message: Notification message
         icon: Optional icon path
-        timeout: How long to show (seconds)
+        timeout: How long to show (seconds, py-notifier only)
     
     Returns:
         True if notification sent
@@ -46,17 +65,18 @@ def send_notification(
         if HAS_NOTIFYPY:
             # Modern notification API
             if os.environ.get('DISPLAY'):
-                notify.init()
-                n = notify.Notification(title, message)
-                if icon:
-                    n.set_icon(icon)
-                n.set_timeout(timeout * 1000)
-                n.show()
-                return True
+                # The instance is shared, so fill and send it under the lock;
+                # a non-blocking send would read the fields after we return
+                with _notifier_lock:
+                    n = _get_notifier()
+                    n.title = title
+                    n.message = message
+                    # Always assign, or the previous caller's icon sticks
+                    n.icon = icon or _default_icon
+                    return bool(n.send(block=True))
         elif HAS_NOTIFIER:
             # Simple notifier
-            notifier = Notifier()
-            notifier.notify(title=title, message=message, app_name='ContentTracker', timeout=timeout)
+            _py_notifier.notify(title=title, message=message, app_name='ContentTracker', timeout=timeout)
             return True
         else:
             # Fallback to terminal print (for development)
@@ -77,16 +97,12 @@ def should_notify(activity_info: Dict[str, Any]) -> bool:
     Returns:
         True if notification should be sent
     """
-    # Check if we should notify based on rules
-    if not activity_info.get('is_productive', False):
-        # Only notify on non-productive activities after threshold
-        duration = activity_info.get('duration', 0)
-        if duration >= 1800:  # 30 minutes
-            return True
-        if activity_info.get('is_nsfw', False):
-            return True
-    
-    return False
+    # Only notify on non-productive activities: NSFW right away, anything
+    # else once it passes the distraction threshold
+    return not activity_info.get('is_productive') and bool(
+        activity_info.get('is_nsfw')
+        or activity_info.get('duration', 0) >= _DISTRACTION_THRESHOLD_SEC
+    )
 
 
 class NotificationType:
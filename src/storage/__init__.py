@@ -14,11 +14,18 @@ from .models import (
     WebsiteUsage,
     FocusSession,
     SCHEMA_SQL,
+    ACTIVITY_COLUMNS,
+    INSERT_ACTIVITY_SQL,
+    FLAG_PRODUCTIVE,
+    FLAG_NSFW,
+    FLAG_IDLE,
+    FLAG_EXCLUDED,
     MIGRATIONS
 )
 
 from .database import (
     Database,
+    FlushBuffer,
     get_database,
     close_database
 )
@@ -35,10 +42,17 @@ __all__ = [
     'WebsiteUsage',
     'FocusSession',
     'SCHEMA_SQL',
+    'ACTIVITY_COLUMNS',
+    'INSERT_ACTIVITY_SQL',
+    'FLAG_PRODUCTIVE',
+    'FLAG_NSFW',
+    'FLAG_IDLE',
+    'FLAG_EXCLUDED',
     'MIGRATIONS',
     
     # Database
     'Database',
+    'FlushBuffer',
     'get_database',
     'close_database'
 ]
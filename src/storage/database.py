@@ -4,14 +4,41 @@ Handles all SQLite database operations with connection pooling and thread safety
 """
 
 import sqlite3
+import sys
 import threading
 import os
-import shutil
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from contextlib import contextmanager
+from functools import lru_cache
 import json
+import re
+import calendar
+import copy
+import atexit
+from collections import deque
+from pathlib import Path
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 from .models import (
     Activity, 
@@ -21,12 +48,269 @@ from .models import (
     WebsiteUsage, 
     FocusSession, 
     SCHEMA_SQL, 
+    PRAGMA_SQL,
+    WRITER_PRAGMA_SQL,
+    WAL_PRAGMA_SQL,
+    INSERT_ACTIVITY_SQL,
+    ACTIVITY_ADDED_COLUMNS,
+    SCORE_SCALES,
+    COUNTED_TABLES,
+    ROW_COUNTS_SQL,
+    EPOCH_SCHEMA_SQL,
+    FTS_SCHEMA_SQL,
+    FTS_TRIGGERS_SQL,
+    FTS_POPULATE_SQL,
+    ROLLUP_DAILY_SQL,
+    decompress_text,
     MIGRATIONS,
     ActivityType
 )
 
 logger = logging.getLogger(__name__)
 
+# Hot statements, built once so SQLite's statement cache always hits.
+# Activity rows are selected in dataclass field order, plus the compressed
+# extracted_text as a trailing column, and unpacked positionally (see
+# _activity_from_row)
+_ACTIVITY_FIELDS = tuple(Activity.__dataclass_fields__) + ('extracted_text_zstd',)
+_ACTIVITY_SELECT = ', '.join(_ACTIVITY_FIELDS)
+
+# Low-cardinality columns whose values repeat across most rows; interned on
+# read so large histories hold a handful of strings instead of one per row
+_SHARED_STRING_FIELDS = tuple(
+    (_ACTIVITY_FIELDS.index(name), name)
+    for name in ('app_name', 'process_name', 'activity_type', 'content_type')
+)
+
+_SQL_GET_ACTIVITY = f"SELECT {_ACTIVITY_SELECT} FROM activities WHERE id = ?"
+_SQL_LAST_ACTIVITY = f"SELECT {_ACTIVITY_SELECT} FROM activities ORDER BY timestamp DESC LIMIT 1"
+_SQL_SELECT_ACTIVITIES = f"SELECT {_ACTIVITY_SELECT} FROM activities WHERE 1=1"
+_SQL_SEARCH = f"""
+    SELECT {_ACTIVITY_SELECT} FROM activities 
+    WHERE content_description LIKE ? 
+       OR content_title LIKE ? 
+       OR activity_text(extracted_text, extracted_text_zstd) LIKE ?
+       OR window_title LIKE ?
+       OR app_name LIKE ?
+    ORDER BY timestamp DESC 
+    LIMIT ?
+"""
+_SQL_SEARCH_FTS = f"""
+    SELECT {', '.join('a.' + name for name in _ACTIVITY_FIELDS)} FROM activities_fts f
+    JOIN activities a ON a.id = f.rowid
+    WHERE activities_fts MATCH ?
+    ORDER BY f.rank
+    LIMIT ?
+"""
+_SQL_INSERT_FOCUS_SESSION = (
+    f"INSERT INTO focus_sessions ({', '.join(FocusSession.COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in FocusSession.COLUMNS)})"
+)
+_SQL_ALL_SETTINGS = "SELECT key, value FROM settings"
+_SQL_SET_SETTING = "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)"
+
+
+# Same columns (and dict keys) as SELECT *, with scores scaled back to floats
+_SQL_DAILY_STATS = "SELECT {cols} FROM daily_stats".format(cols=', '.join(
+    f"{name}_x{SCORE_SCALES['daily_stats'][name]} / {float(SCORE_SCALES['daily_stats'][name])} AS {name}"
+    if name in SCORE_SCALES['daily_stats'] else name
+    for name in DailyStats.__dataclass_fields__
+))
+
+
+# Record layout for get_stats_range_np(), in _SQL_DAILY_STATS column order
+if HAS_NUMPY:
+    _DAILY_STATS_DTYPE = np.dtype([
+        (name, 'U10' if name == 'date' else {int: 'i8', float: 'f8'}.get(f.type, 'i8' if name == 'id' else 'O'))
+        for name, f in DailyStats.__dataclass_fields__.items()
+    ])
+
+
+_SQL_FOLD_APP_USAGE = """
+    INSERT INTO app_usage (date, app_name, total_time, session_count, productivity_score_x1000)
+    SELECT 
+        date(timestamp) as date,
+        app_name,
+        SUM(duration) as total_time,
+        COUNT(*) as session_count,
+        CAST(round(AVG(productivity_score) * 1000) AS INTEGER) as productivity_score_x1000
+    FROM activities 
+    WHERE id > ? AND id <= ? AND app_name != '' AND app_name IS NOT NULL
+    GROUP BY date(timestamp), app_name
+    ON CONFLICT(date, app_name) DO UPDATE SET
+        productivity_score_x1000 = CAST(round(
+            (productivity_score_x1000 * session_count
+             + excluded.productivity_score_x1000 * excluded.session_count)
+            * 1.0 / (session_count + excluded.session_count)) AS INTEGER),
+        total_time = total_time + excluded.total_time,
+        session_count = session_count + excluded.session_count
+"""
+_SQL_FOLD_WEBSITE_USAGE = """
+    INSERT INTO website_usage (date, website, total_time, visit_count, productivity_score_x1000)
+    SELECT 
+        date(timestamp) as date,
+        website,
+        SUM(duration) as total_time,
+        COUNT(*) as visit_count,
+        CAST(round(AVG(productivity_score) * 1000) AS INTEGER) as productivity_score_x1000
+    FROM activities 
+    WHERE id > ? AND id <= ? AND website != '' AND website IS NOT NULL
+    GROUP BY date(timestamp), website
+    ON CONFLICT(date, website) DO UPDATE SET
+        productivity_score_x1000 = CAST(round(
+            (productivity_score_x1000 * visit_count
+             + excluded.productivity_score_x1000 * excluded.visit_count)
+            * 1.0 / (visit_count + excluded.visit_count)) AS INTEGER),
+        total_time = total_time + excluded.total_time,
+        visit_count = visit_count + excluded.visit_count
+"""
+_SQL_FOLD_WEBSITE_CATEGORIES = """
+    INSERT OR IGNORE INTO website_usage_categories (website_usage_id, category)
+    SELECT DISTINCT wu.id, a.content_category
+    FROM activities a
+    JOIN website_usage wu ON wu.date = date(a.timestamp) AND wu.website = a.website
+    WHERE a.id > ? AND a.id <= ? AND a.website != '' AND a.content_category != ''
+"""
+
+
+if HAS_PYARROW:
+    # Columnar layout for exported history; repetitive categorical columns
+    # are dictionary-encoded
+    _ARROW_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+    ACTIVITY_ARROW_SCHEMA = pa.schema([
+        ('id', pa.int64()),
+        ('timestamp', pa.timestamp('us')),
+        ('app_name', _ARROW_CATEGORY),
+        ('window_title', pa.string()),
+        ('process_name', pa.string()),
+        ('process_id', pa.int64()),
+        ('website', pa.string()),
+        ('url', pa.string()),
+        ('content_type', _ARROW_CATEGORY),
+        ('content_category', pa.string()),
+        ('content_description', pa.string()),
+        ('content_title', pa.string()),
+        ('activity_type', _ARROW_CATEGORY),
+        ('is_productive', pa.bool_()),
+        ('productivity_score', pa.float64()),
+        ('detection_method', pa.string()),
+        ('confidence', pa.float64()),
+        ('nsfw_score', pa.float64()),
+        ('is_nsfw', pa.bool_()),
+        ('duration', pa.int64()),
+        ('screenshot_path', pa.string()),
+        ('is_idle', pa.bool_()),
+        ('is_excluded', pa.bool_()),
+        ('extracted_text', pa.string()),
+    ])
+    
+    # SQLite hands back timestamps as text and booleans as 0/1; these are
+    # converted with one vectorized cast per column
+    _ARROW_SOURCE_TYPES = [
+        pa.string() if pa.types.is_timestamp(f.type) else
+        pa.int8() if pa.types.is_boolean(f.type) else
+        f.type
+        for f in ACTIVITY_ARROW_SCHEMA
+    ]
+
+# Text columns are read raw (CAST bypasses PARSE_DECLTYPES) and
+# extracted_text is decompressed in SQL
+_SQL_EXPORT_ACTIVITIES = "SELECT " + ", ".join(
+    "CAST(timestamp AS TEXT)" if name == 'timestamp' else
+    "activity_text(extracted_text, extracted_text_zstd)" if name == 'extracted_text' else
+    name
+    for name in Activity.__dataclass_fields__
+) + " FROM activities WHERE 1=1"
+
+
+def _activity_from_row(row: tuple) -> Activity:
+    """Build an Activity from a plain row tuple in _ACTIVITY_FIELDS order."""
+    activity = Activity.from_row_fast(row)
+    
+    # Share one string object per distinct value across loaded rows
+    for index, name in _SHARED_STRING_FIELDS:
+        value = row[index]
+        if value:
+            setattr(activity, name, sys.intern(value))
+    
+    if row[-1]:
+        activity.extracted_text = decompress_text(activity.extracted_text, row[-1])
+    return activity
+
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """
+    Fetch the remaining rows of a query as dicts.
+    
+    Column names are read from cursor.description once per query, where
+    dict(sqlite3.Row) looks them up again for every row.
+    """
+    cursor.row_factory = None
+    names = tuple(column[0] for column in cursor.description)
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def _encode_setting(value: Any) -> Any:
+    """Encode a setting for storage (msgpack BLOB, or JSON without msgpack)."""
+    if isinstance(value, str):
+        return value
+    if HAS_MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    return json.dumps(value)
+
+
+def _decode_setting(value: Any) -> Any:
+    """Decode a stored setting (msgpack BLOB, JSON if possible, raw text otherwise)."""
+    if isinstance(value, bytes):
+        if not HAS_MSGPACK:
+            logger.warning("msgpack not available, cannot decode stored setting")
+            return None
+        return msgpack.unpackb(value, raw=False, strict_map_key=False)
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return value
+
+
+def _day_range(date: str) -> Tuple[int, int]:
+    """
+    Convert a YYYY-MM-DD date into a half-open timestamp_epoch range.
+    
+    Integer range compares match date(timestamp) = date but are
+    sargable against the timestamp_epoch index.
+    """
+    start = calendar.timegm(datetime.strptime(date, "%Y-%m-%d").timetuple())
+    return start, start + _SECONDS_PER_DAY
+
+
+_SECONDS_PER_DAY = 86400
+
+_FTS_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _fts_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query.
+    
+    The words are matched as one phrase with a prefix match on the last
+    word, which approximates the substring match of the LIKE fallback
+    without exposing FTS5 operator syntax to user input.
+    
+    Returns:
+        FTS5 MATCH expression, or "" if the query has no word characters
+    """
+    tokens = _FTS_TOKEN_RE.findall(query)
+    if not tokens:
+        return ""
+    return '"' + ' '.join(tokens) + '"*'
+
+
+@lru_cache(maxsize=32)
+def _focus_session_update_sql(columns: Tuple[str, ...]) -> str:
+    """Build (and cache) the UPDATE statement for a set of focus session columns."""
+    set_clause = ', '.join(f"{column} = ?" for column in columns)
+    return f"UPDATE focus_sessions SET {set_clause} WHERE id = ?"
+
 
 class Database:
     """
@@ -34,6 +318,15 @@ class Database:
     Manages all database operations for the content tracker.
     """
     
+    # Size of sqlite3's per-connection prepared statement cache
+    STATEMENT_CACHE_SIZE = 256
+    
+    # Minimum seconds between PRAGMA optimize runs
+    OPTIMIZE_INTERVAL = 900
+    
+    # Rows fetched per fetchmany() call when streaming activities
+    FETCH_SIZE = 256
+    
     def __init__(self, db_path: str = "data/activity.db", wal_mode: bool = True):
         """
         Initialize database connection.
@@ -46,6 +339,12 @@ class Database:
         self.wal_mode = wal_mode
         self._local = threading.local()
         self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._settings_cache: Dict[str, Any] = {}
+        self._settings_loaded = False
+        self._last_optimize = 0.0
+        self.has_fts = False
         
         # Ensure directory exists
         db_dir = os.path.dirname(db_path)
@@ -57,53 +356,265 @@ class Database:
         
         logger.info(f"Database initialized: {db_path}")
     
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply the pragmas shared by the writer and reader connections."""
+        conn.row_factory = sqlite3.Row
+        conn.create_function("activity_text", 2, decompress_text, deterministic=True)
+        conn.executescript(PRAGMA_SQL)
+    
     def _get_connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection."""
-        if not hasattr(self._local, 'connection') or self._local.connection is None:
-            self._local.connection = sqlite3.connect(
+        """Get the shared writer connection (use under self._write_lock)."""
+        if self._writer is None:
+            conn = sqlite3.connect(
                 self.db_path,
                 detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
                 check_same_thread=False,
-                timeout=30.0
+                timeout=30.0,
+                isolation_level='DEFERRED',
+                cached_statements=self.STATEMENT_CACHE_SIZE
             )
-            self._local.connection.row_factory = sqlite3.Row
+            
+            conn.executescript(WRITER_PRAGMA_SQL)
             
             # Enable WAL mode for better concurrency
             if self.wal_mode:
-                self._local.connection.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(WAL_PRAGMA_SQL)
             
-            # Enable foreign keys
-            self._local.connection.execute("PRAGMA foreign_keys=ON")
+            self._configure_connection(conn)
             
-            # Performance optimizations
-            self._local.connection.execute("PRAGMA synchronous=NORMAL")
-            self._local.connection.execute("PRAGMA cache_size=10000")
-            self._local.connection.execute("PRAGMA temp_store=MEMORY")
+            # The FTS sync triggers are per-connection (TEMP)
+            if self.has_fts:
+                conn.executescript(FTS_TRIGGERS_SQL)
+            
+            self._writer = conn
+        
+        return self._writer
+    
+    def _get_reader(self) -> sqlite3.Connection:
+        """Get thread-local read-only database connection."""
+        if getattr(self._local, 'reader', None) is None:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(
+                uri,
+                uri=True,
+                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                check_same_thread=False,
+                timeout=30.0,
+                cached_statements=self.STATEMENT_CACHE_SIZE
+            )
+            conn.execute("PRAGMA query_only=1")
+            self._configure_connection(conn)
+            self._local.reader = conn
+        
+        return self._local.reader
+    
+    @contextmanager
+    def get_write_cursor(self):
+        """
+        Context manager for writer cursor with automatic commit/rollback.
         
-        return self._local.connection
+        Write cursors nest: only the outermost one (or the enclosing
+        transaction() block) commits or rolls back, so inner calls join
+        its transaction.
+        """
+        with self._write_lock:
+            conn = self._get_connection()
+            depth = getattr(self._local, 'txn_depth', 0)
+            self._local.txn_depth = depth + 1
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                if depth == 0:
+                    conn.commit()
+            except Exception as e:
+                if depth == 0:
+                    conn.rollback()
+                    # Nested set_setting() calls were rolled back too
+                    self._settings_loaded = False
+                logger.error(f"Database error: {e}")
+                raise
+            finally:
+                cursor.close()
+                self._local.txn_depth = depth
+    
+    # Older name for get_write_cursor()
+    get_cursor = get_write_cursor
     
     @contextmanager
-    def get_cursor(self):
-        """Context manager for database cursor with automatic commit/rollback."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+    def get_read_cursor(self):
+        """
+        Context manager for a read-only cursor.
+        
+        Reads use this thread's read-only connection, so they never take
+        the writer lock or start a write transaction.
+        """
+        cursor = self._get_reader().cursor()
         try:
             yield cursor
-            conn.commit()
         except Exception as e:
-            conn.rollback()
             logger.error(f"Database error: {e}")
             raise
         finally:
             cursor.close()
     
+    @contextmanager
+    def _activity_cursor(self):
+        """
+        Read cursor returning plain tuples for _activity_from_row.
+        
+        Skips sqlite3.Row and the dict(row) -> from_dict() round trip.
+        """
+        with self.get_read_cursor() as cursor:
+            cursor.row_factory = None
+            cursor.arraysize = self.FETCH_SIZE
+            yield cursor
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group several operations into a single transaction.
+        
+        Calls made inside the block share one BEGIN IMMEDIATE/COMMIT
+        instead of committing individually. Nested blocks join the
+        outer transaction.
+        """
+        if getattr(self._local, 'txn_depth', 0):
+            yield
+            return
+        
+        with self._write_lock:
+            conn = self._get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.txn_depth = 1
+            try:
+                yield
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                # Settings written inside the block were rolled back too
+                self._settings_loaded = False
+                raise
+            finally:
+                self._local.txn_depth = 0
+    
     def _init_database(self):
         """Initialize database schema."""
         with self._lock:
-            with self.get_cursor() as cursor:
+            with self.get_write_cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'website_usage_categories'"
+                )
+                has_categories = cursor.fetchone() is not None
+                
                 cursor.executescript(SCHEMA_SQL)
+                
+                # Rebuild website_usage on the next fold so existing rows get categories
+                if not has_categories:
+                    cursor.execute("DELETE FROM settings WHERE key = 'website_usage_last_activity_id'")
+                
+                # Gather planner statistics once; later runs use PRAGMA optimize
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+                )
+                if cursor.fetchone() is None:
+                    cursor.execute("ANALYZE")
+            
+            self._add_missing_columns()
+            self._quantize_scores()
+            self._init_row_counts()
+            self._init_fts()
+        
+        self.optimize(force=True)
         logger.debug("Database schema initialized")
     
+    def _add_missing_columns(self):
+        """Bring older activities tables up to date, then backfill timestamp_epoch."""
+        with self.get_write_cursor() as cursor:
+            cursor.execute("PRAGMA table_info(activities)")
+            existing = {row['name'] for row in cursor.fetchall()}
+            for column, declaration in ACTIVITY_ADDED_COLUMNS.items():
+                if column not in existing:
+                    cursor.execute(f"ALTER TABLE activities ADD COLUMN {column} {declaration}")
+            cursor.executescript(EPOCH_SCHEMA_SQL)
+    
+    def _quantize_scores(self):
+        """Convert REAL score columns from older databases to scaled integers."""
+        for table, scales in SCORE_SCALES.items():
+            with self.get_write_cursor() as cursor:
+                cursor.execute(f"PRAGMA table_info({table})")
+                existing = {row['name'] for row in cursor.fetchall()}
+            
+            for column, scale in scales.items():
+                stored = f"{column}_x{scale}"
+                if column not in existing or stored in existing:
+                    continue
+                
+                with self.transaction():
+                    conn = self._get_connection()
+                    try:
+                        conn.execute(f"ALTER TABLE {table} RENAME COLUMN {column} TO {stored}")
+                        source = stored
+                    except sqlite3.OperationalError:
+                        # SQLite < 3.25 has no RENAME COLUMN; leave the old column unused
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {stored} INTEGER DEFAULT 0")
+                        source = column
+                    conn.execute(
+                        f"UPDATE {table} SET {stored} = CAST(round({source} * {scale}) AS INTEGER)"
+                    )
+                logger.info(f"Stored {table}.{column} as scaled integer {stored}")
+    
+    def _init_row_counts(self):
+        """Create row_counts and its triggers, seeding counts from existing rows."""
+        with self.get_write_cursor() as cursor:
+            cursor.executescript("BEGIN IMMEDIATE;" + ROW_COUNTS_SQL + "COMMIT;")
+    
+    def _init_fts(self):
+        """Create the FTS5 search index, if this SQLite build supports it."""
+        try:
+            with self.get_write_cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activities_fts'"
+                )
+                exists = cursor.fetchone() is not None
+                cursor.executescript(FTS_SCHEMA_SQL + FTS_TRIGGERS_SQL)
+                
+                # Index rows written before the FTS table existed
+                if not exists:
+                    cursor.execute(FTS_POPULATE_SQL)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, using LIKE search: {e}")
+    
+    def rebuild_search_index(self):
+        """
+        Re-index all activities for full-text search.
+        
+        Needed after activities were modified outside Database (e.g. with
+        the sqlite3 CLI), since the index is only kept in sync by triggers
+        on Database's own connection.
+        """
+        if not self.has_fts:
+            return
+        
+        with self.get_write_cursor() as cursor:
+            cursor.execute("INSERT INTO activities_fts(activities_fts) VALUES ('delete-all')")
+            cursor.execute(FTS_POPULATE_SQL)
+    
+    def optimize(self, force: bool = False):
+        """
+        Run PRAGMA optimize to keep query planner statistics current.
+        
+        Args:
+            force: Run even if OPTIMIZE_INTERVAL has not elapsed
+        """
+        now = time.monotonic()
+        if not force and now - self._last_optimize < self.OPTIMIZE_INTERVAL:
+            return
+        
+        self._last_optimize = now
+        with self.get_write_cursor() as cursor:
+            cursor.execute("PRAGMA optimize")
+    
     # ==================== Activity Operations ====================
     
     def insert_activity(self, activity: Activity) -> int:
@@ -116,19 +627,34 @@ class Database:
         Returns:
             ID of inserted activity
         """
-        data = activity.to_dict()
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['?' for _ in data])
-        
-        with self.get_cursor() as cursor:
-            cursor.execute(
-                f"INSERT INTO activities ({columns}) VALUES ({placeholders})",
-                list(data.values())
-            )
+        with self.get_write_cursor() as cursor:
+            cursor.execute(INSERT_ACTIVITY_SQL, activity.to_row_tuple())
             activity_id = cursor.lastrowid
             logger.debug(f"Inserted activity {activity_id}: {activity.content_description[:50] if activity.content_description else 'N/A'}")
             return activity_id
     
+    def insert_activities(self, activities: List[Activity]) -> int:
+        """
+        Insert multiple activity records in a single transaction.
+        
+        Args:
+            activities: Activity objects to insert
+            
+        Returns:
+            Number of inserted activities
+        """
+        if not activities:
+            return 0
+        
+        with self.transaction(), self.get_write_cursor() as cursor:
+            cursor.executemany(
+                INSERT_ACTIVITY_SQL,
+                (activity.to_row_tuple() for activity in activities)
+            )
+        
+        logger.debug(f"Inserted {len(activities)} activities")
+        return len(activities)
+    
     def get_activity(self, activity_id: int) -> Optional[Activity]:
         """
         Get a single activity by ID.
@@ -139,14 +665,14 @@ class Database:
         Returns:
             Activity object or None
         """
-        with self.get_cursor() as cursor:
-            cursor.execute("SELECT * FROM activities WHERE id = ?", (activity_id,))
+        with self._activity_cursor() as cursor:
+            cursor.execute(_SQL_GET_ACTIVITY, (activity_id,))
             row = cursor.fetchone()
             if row:
-                return Activity.from_dict(dict(row))
+                return _activity_from_row(row)
         return None
     
-    def get_activities(
+    def iter_activities(
         self,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
@@ -158,9 +684,12 @@ class Database:
         limit: int = 1000,
         offset: int = 0,
         order_desc: bool = True
-    ) -> List[Activity]:
+    ) -> Iterator[Activity]:
         """
-        Query activities with filters.
+        Query activities with filters, yielding them as rows are read.
+        
+        Rows are streamed from the cursor, so callers that aggregate or
+        stop early never hold the whole result set in memory.
         
         Args:
             start_time: Filter by start time
@@ -174,10 +703,10 @@ class Database:
             offset: Offset for pagination
             order_desc: Order by timestamp descending
             
-        Returns:
-            List of Activity objects
+        Yields:
+            Activity objects
         """
-        query = "SELECT * FROM activities WHERE 1=1"
+        query = _SQL_SELECT_ACTIVITIES
         params = []
         
         if start_time:
@@ -200,21 +729,58 @@ class Database:
             query += " AND website LIKE ?"
             params.append(f"%{website}%")
         
+        # Boolean filters are inlined so the planner can match partial indexes
         if is_productive is not None:
-            query += " AND is_productive = ?"
-            params.append(1 if is_productive else 0)
+            query += " AND is_productive = 1" if is_productive else " AND is_productive = 0"
         
         if is_nsfw is not None:
-            query += " AND is_nsfw = ?"
-            params.append(1 if is_nsfw else 0)
+            query += " AND is_nsfw = 1" if is_nsfw else " AND is_nsfw = 0"
         
         order_dir = "DESC" if order_desc else "ASC"
         query += f" ORDER BY timestamp {order_dir} LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         
-        with self.get_cursor() as cursor:
+        with self._activity_cursor() as cursor:
             cursor.execute(query, params)
-            return [Activity.from_dict(dict(row)) for row in cursor.fetchall()]
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield _activity_from_row(row)
+                rows = cursor.fetchmany()
+    
+    def get_activities(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        activity_type: Optional[str] = None,
+        app_name: Optional[str] = None,
+        website: Optional[str] = None,
+        is_productive: Optional[bool] = None,
+        is_nsfw: Optional[bool] = None,
+        limit: int = 1000,
+        offset: int = 0,
+        order_desc: bool = True
+    ) -> List[Activity]:
+        """
+        Query activities with filters.
+        
+        Same arguments as iter_activities().
+        
+        Returns:
+            List of Activity objects
+        """
+        return list(self.iter_activities(
+            start_time=start_time,
+            end_time=end_time,
+            activity_type=activity_type,
+            app_name=app_name,
+            website=website,
+            is_productive=is_productive,
+            is_nsfw=is_nsfw,
+            limit=limit,
+            offset=offset,
+            order_desc=order_desc
+        ))
     
     def get_recent_activities(self, hours: int = 24, limit: int = 1000) -> List[Activity]:
         """
@@ -237,11 +803,11 @@ class Database:
         Returns:
             Most recent Activity or None
         """
-        with self.get_cursor() as cursor:
-            cursor.execute("SELECT * FROM activities ORDER BY timestamp DESC LIMIT 1")
+        with self._activity_cursor() as cursor:
+            cursor.execute(_SQL_LAST_ACTIVITY)
             row = cursor.fetchone()
             if row:
-                return Activity.from_dict(dict(row))
+                return _activity_from_row(row)
         return None
     
     def get_activities_count(
@@ -261,10 +827,70 @@ class Database:
             query += " AND timestamp <= ?"
             params.append(end_time.isoformat())
         
-        with self.get_cursor() as cursor:
+        with self.get_read_cursor() as cursor:
             cursor.execute(query, params)
             return cursor.fetchone()[0]
     
+    def export_activities_parquet(
+        self,
+        filepath: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        batch_size: int = 10000
+    ) -> int:
+        """
+        Stream activities into a Parquet file.
+        
+        Rows go from the cursor into Arrow record batches of batch_size
+        rows, so no Activity objects are built and memory stays bounded
+        regardless of history size.
+        
+        Args:
+            filepath: Output .parquet path
+            start_time: Filter by start time
+            end_time: Filter by end time
+            batch_size: Rows per record batch
+            
+        Returns:
+            Number of exported activities
+        """
+        if not HAS_PYARROW:
+            raise RuntimeError("pyarrow is required for Parquet export")
+        
+        query = _SQL_EXPORT_ACTIVITIES
+        params = []
+        
+        if start_time:
+            query += " AND timestamp >= ?"
+            params.append(start_time.isoformat() if isinstance(start_time, datetime) else start_time)
+        
+        if end_time:
+            query += " AND timestamp <= ?"
+            params.append(end_time.isoformat() if isinstance(end_time, datetime) else end_time)
+        
+        query += " ORDER BY timestamp"
+        
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        
+        total = 0
+        with self.get_read_cursor() as cursor, \
+                pq.ParquetWriter(filepath, ACTIVITY_ARROW_SCHEMA) as writer:
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            
+            rows = cursor.fetchmany(batch_size)
+            while rows:
+                arrays = [
+                    pa.array(column, type=source).cast(field.type)
+                    for column, source, field in zip(zip(*rows), _ARROW_SOURCE_TYPES, ACTIVITY_ARROW_SCHEMA)
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=ACTIVITY_ARROW_SCHEMA))
+                total += len(rows)
+                rows = cursor.fetchmany(batch_size)
+        
+        logger.info(f"Exported {total} activities to {filepath}")
+        return total
+    
     # ==================== Daily Stats Operations ====================
     
     def update_daily_stats(self, date: str = None):
@@ -277,121 +903,10 @@ class Database:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        with self.get_cursor() as cursor:
-            # Calculate stats from activities
-            cursor.execute("""
-                SELECT 
-                    activity_type,
-                    SUM(duration) as total_time,
-                    COUNT(*) as session_count,
-                    SUM(CASE WHEN is_nsfw = 1 THEN 1 ELSE 0 END) as nsfw_count
-                FROM activities 
-                WHERE date(timestamp) = ?
-                GROUP BY activity_type
-            """, (date,))
-            
-            stats = {}
-            total_nsfw = 0
-            for row in cursor.fetchall():
-                stats[row['activity_type']] = {
-                    'time': row['total_time'] or 0,
-                    'count': row['session_count'] or 0
-                }
-                total_nsfw += row['nsfw_count'] or 0
-            
-            # Calculate totals
-            total_time = sum(s['time'] for s in stats.values())
-            total_sessions = sum(s['count'] for s in stats.values())
-            
-            # Get distinct app count (app switches approximation)
-            cursor.execute("""
-                SELECT COUNT(DISTINCT app_name) as app_count,
-                       COUNT(DISTINCT website) as website_count
-                FROM activities 
-                WHERE date(timestamp) = ?
-            """, (date,))
-            counts = cursor.fetchone()
-            app_switches = counts['app_count'] if counts else 0
-            website_visits = counts['website_count'] if counts else 0
-            
-            # Get top app
-            cursor.execute("""
-                SELECT app_name, SUM(duration) as total
-                FROM activities 
-                WHERE date(timestamp) = ? AND app_name != '' AND app_name IS NOT NULL
-                GROUP BY app_name 
-                ORDER BY total DESC 
-                LIMIT 1
-            """, (date,))
-            top_app_row = cursor.fetchone()
-            top_app = top_app_row['app_name'] if top_app_row else ''
-            
-            # Get top website
-            cursor.execute("""
-                SELECT website, SUM(duration) as total
-                FROM activities 
-                WHERE date(timestamp) = ? AND website != '' AND website IS NOT NULL
-                GROUP BY website 
-                ORDER BY total DESC 
-                LIMIT 1
-            """, (date,))
-            top_website_row = cursor.fetchone()
-            top_website = top_website_row['website'] if top_website_row else ''
-            
-            # Get top content category
-            cursor.execute("""
-                SELECT content_category, SUM(duration) as total
-                FROM activities 
-                WHERE date(timestamp) = ? AND content_category != '' AND content_category IS NOT NULL
-                GROUP BY content_category 
-                ORDER BY total DESC 
-                LIMIT 1
-            """, (date,))
-            top_cat_row = cursor.fetchone()
-            top_category = top_cat_row['content_category'] if top_cat_row else ''
-            
-            # Calculate productivity score
-            productive_time = stats.get('productive', {}).get('time', 0)
-            educational_time = stats.get('educational', {}).get('time', 0)
-            
-            if total_time > 0:
-                productivity_score = ((productive_time + educational_time * 0.8) / total_time) * 100
-                productivity_score = min(100.0, max(0.0, productivity_score))
-            else:
-                productivity_score = 0.0
-            
-            # Insert or update daily stats
-            cursor.execute("""
-                INSERT OR REPLACE INTO daily_stats (
-                    date, total_tracked_time, productive_time, educational_time,
-                    entertainment_time, social_media_time, gaming_time, shopping_time,
-                    news_time, adult_content_time, neutral_time, idle_time,
-                    productivity_score, focus_score, total_sessions, app_switches,
-                    website_visits, nsfw_detections, top_app, top_website, top_content_category
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                date,
-                total_time,
-                stats.get('productive', {}).get('time', 0),
-                stats.get('educational', {}).get('time', 0),
-                stats.get('entertainment', {}).get('time', 0),
-                stats.get('social_media', {}).get('time', 0),
-                stats.get('gaming', {}).get('time', 0),
-                stats.get('shopping', {}).get('time', 0),
-                stats.get('news', {}).get('time', 0),
-                stats.get('adult', {}).get('time', 0),
-                stats.get('neutral', {}).get('time', 0),
-                stats.get('idle', {}).get('time', 0),
-                productivity_score,
-                0.0,  # focus_score - calculated separately
-                total_sessions,
-                app_switches,
-                website_visits,
-                total_nsfw,
-                top_app,
-                top_website,
-                top_category
-            ))
+        start, end = _day_range(date)
+        with self.get_write_cursor() as cursor:
+            # Aggregated and written by SQLite in one statement
+            cursor.execute(ROLLUP_DAILY_SQL, {'date': date, 'start': start, 'end': end})
             
             logger.debug(f"Updated daily stats for {date}")
     
@@ -408,12 +923,10 @@ class Database:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        with self.get_cursor() as cursor:
-            cursor.execute("SELECT * FROM daily_stats WHERE date = ?", (date,))
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
-        return None
+        with self.get_read_cursor() as cursor:
+            cursor.execute(_SQL_DAILY_STATS + " WHERE date = ?", (date,))
+            rows = _fetch_dicts(cursor)
+        return rows[0] if rows else None
     
     def get_stats_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """
@@ -426,52 +939,111 @@ class Database:
         Returns:
             List of daily stats dicts
         """
-        with self.get_cursor() as cursor:
+        with self.get_read_cursor() as cursor:
             cursor.execute(
-                "SELECT * FROM daily_stats WHERE date BETWEEN ? AND ? ORDER BY date",
+                _SQL_DAILY_STATS + " WHERE date BETWEEN ? AND ? ORDER BY date",
                 (start_date, end_date)
             )
-            return [dict(row) for row in cursor.fetchall()]
+            return _fetch_dicts(cursor)
     
-    # ==================== App/Website Usage ====================
+    def get_stats_range_np(self, start_date: str, end_date: str) -> 'np.ndarray':
+        """
+        Get daily statistics for a date range as a NumPy structured array.
+        
+        Same fields as get_stats_range(), built straight from the cursor
+        without a dict per row. Use pandas.DataFrame.from_records() on the
+        result for a DataFrame.
+        
+        Args:
+            start_date: Start date YYYY-MM-DD
+            end_date: End date YYYY-MM-DD
+            
+        Returns:
+            Structured array with one record per day
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy is required for get_stats_range_np")
+        
+        with self.get_read_cursor() as cursor:
+            cursor.row_factory = None
+            cursor.execute(
+                _SQL_DAILY_STATS + " WHERE date BETWEEN ? AND ? ORDER BY date",
+                (start_date, end_date)
+            )
+            return np.fromiter(cursor, dtype=_DAILY_STATS_DTYPE)
     
-    def update_app_usage(self, date: str = None):
-        """Update app usage summary for a date."""
+    def update_summaries(self, date: str = None):
+        """
+        Refresh daily stats, app usage and website usage for a date.
+        
+        All three updates share one transaction.
+        
+        Args:
+            date: Date in YYYY-MM-DD format (defaults to today)
+        """
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        with self.get_cursor() as cursor:
-            cursor.execute("""
-                INSERT OR REPLACE INTO app_usage (date, app_name, total_time, session_count, productivity_score)
-                SELECT 
-                    date(timestamp) as date,
-                    app_name,
-                    SUM(duration) as total_time,
-                    COUNT(*) as session_count,
-                    AVG(productivity_score) as productivity_score
-                FROM activities 
-                WHERE date(timestamp) = ? AND app_name != '' AND app_name IS NOT NULL
-                GROUP BY date(timestamp), app_name
-            """, (date,))
+        with self.transaction():
+            self.update_daily_stats(date)
+            self.update_app_usage(date)
+            self.update_website_usage(date)
+    
+    # ==================== App/Website Usage ====================
+    
+    def update_app_usage(self, date: str = None):
+        """
+        Fold activities recorded since the last update into app usage.
+        
+        Only rows added after the previous call are aggregated, and they
+        are merged into existing (date, app_name) rows with an UPSERT,
+        so every date touched by new activity is brought up to date.
+        
+        Args:
+            date: Kept for compatibility; all pending dates are updated
+        """
+        self._fold_usage('app_usage', _SQL_FOLD_APP_USAGE)
     
     def update_website_usage(self, date: str = None):
-        """Update website usage summary for a date."""
-        if date is None:
-            date = datetime.now().strftime("%Y-%m-%d")
+        """
+        Fold activities recorded since the last update into website usage.
         
-        with self.get_cursor() as cursor:
-            cursor.execute("""
-                INSERT OR REPLACE INTO website_usage (date, website, total_time, visit_count, productivity_score)
-                SELECT 
-                    date(timestamp) as date,
-                    website,
-                    SUM(duration) as total_time,
-                    COUNT(*) as visit_count,
-                    AVG(productivity_score) as productivity_score
-                FROM activities 
-                WHERE date(timestamp) = ? AND website != '' AND website IS NOT NULL
-                GROUP BY date(timestamp), website
-            """, (date,))
+        Args:
+            date: Kept for compatibility; all pending dates are updated
+        """
+        self._fold_usage('website_usage', _SQL_FOLD_WEBSITE_USAGE, _SQL_FOLD_WEBSITE_CATEGORIES)
+    
+    def _fold_usage(self, table: str, *fold_sql: str):
+        """
+        Aggregate activities newer than the table's watermark into it.
+        
+        The watermark is the highest activity id already folded in,
+        stored in settings. Without one (new or pre-existing database)
+        the table is rebuilt from scratch so rows are not counted twice.
+        
+        Args:
+            table: Usage table name
+            fold_sql: Statements run in order over the new activity id range,
+                starting with the table's INSERT ... ON CONFLICT DO UPDATE
+        """
+        watermark_key = f"{table}_last_activity_id"
+        
+        with self.transaction():
+            last_id = self.get_setting(watermark_key)
+            
+            with self.get_write_cursor() as cursor:
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM activities")
+                max_id = cursor.fetchone()[0]
+                
+                if last_id is None:
+                    cursor.execute(f"DELETE FROM {table}")
+                    last_id = 0
+                
+                if max_id > last_id:
+                    for sql in fold_sql:
+                        cursor.execute(sql, (last_id, max_id))
+            
+            self.set_setting(watermark_key, max_id)
     
     def get_top_apps(self, date: str = None, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -487,15 +1059,16 @@ class Database:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        with self.get_cursor() as cursor:
+        with self.get_read_cursor() as cursor:
             cursor.execute("""
-                SELECT app_name, total_time, session_count, productivity_score
+                SELECT app_name, total_time, session_count,
+                       productivity_score_x1000 / 1000.0 AS productivity_score
                 FROM app_usage 
                 WHERE date = ?
                 ORDER BY total_time DESC 
                 LIMIT ?
             """, (date, limit))
-            return [dict(row) for row in cursor.fetchall()]
+            return _fetch_dicts(cursor)
     
     def get_top_websites(self, date: str = None, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -511,15 +1084,23 @@ class Database:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        with self.get_cursor() as cursor:
+        with self.get_read_cursor() as cursor:
             cursor.execute("""
-                SELECT website, total_time, visit_count, productivity_score
+                SELECT website, total_time, visit_count,
+                       productivity_score_x1000 / 1000.0 AS productivity_score,
+                       (SELECT group_concat(category, char(31)) FROM website_usage_categories c
+                        WHERE c.website_usage_id = website_usage.id) AS content_categories
                 FROM website_usage 
                 WHERE date = ?
                 ORDER BY total_time DESC 
                 LIMIT ?
             """, (date, limit))
-            return [dict(row) for row in cursor.fetchall()]
+            rows = _fetch_dicts(cursor)
+        
+        for row in rows:
+            categories = row['content_categories']
+            row['content_categories'] = categories.split('\x1f') if categories else []
+        return rows
     
     # ==================== Search and Analysis ====================
     
@@ -534,20 +1115,17 @@ class Database:
         Returns:
             List of matching Activity objects
         """
+        fts_query = _fts_query(query) if self.has_fts else ""
+        if fts_query:
+            with self._activity_cursor() as cursor:
+                cursor.execute(_SQL_SEARCH_FTS, (fts_query, limit))
+                return [_activity_from_row(row) for row in cursor.fetchall()]
+        
         search_pattern = f"%{query}%"
         
-        with self.get_cursor() as cursor:
-            cursor.execute("""
-                SELECT * FROM activities 
-                WHERE content_description LIKE ? 
-                   OR content_title LIKE ? 
-                   OR extracted_text LIKE ?
-                   OR window_title LIKE ?
-                   OR app_name LIKE ?
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (search_pattern, search_pattern, search_pattern, search_pattern, search_pattern, limit))
-            return [Activity.from_dict(dict(row)) for row in cursor.fetchall()]
+        with self._activity_cursor() as cursor:
+            cursor.execute(_SQL_SEARCH, (search_pattern, search_pattern, search_pattern, search_pattern, search_pattern, limit))
+            return [_activity_from_row(row) for row in cursor.fetchall()]
     
     def get_time_by_category(self, date: str = None) -> Dict[str, int]:
         """
@@ -562,15 +1140,43 @@ class Database:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        with self.get_cursor() as cursor:
+        with self.get_read_cursor() as cursor:
             cursor.execute("""
                 SELECT activity_type, SUM(duration) as total_time
                 FROM activities 
-                WHERE date(timestamp) = ?
+                WHERE timestamp_epoch >= ? AND timestamp_epoch < ?
                 GROUP BY activity_type
-            """, (date,))
+            """, _day_range(date))
             return {row['activity_type']: row['total_time'] or 0 for row in cursor.fetchall()}
     
+    def get_activity_type_totals(self, date: str = None) -> List[Dict[str, Any]]:
+        """
+        Get per-activity-type totals for a date, aggregated in SQL.
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+            
+        Returns:
+            List of dicts with activity_type, total_time, session_count,
+            confidence_sum and nsfw_count
+        """
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d")
+        
+        with self.get_read_cursor() as cursor:
+            cursor.execute("""
+                SELECT 
+                    activity_type,
+                    SUM(duration) as total_time,
+                    COUNT(*) as session_count,
+                    SUM(confidence) as confidence_sum,
+                    SUM(CASE WHEN is_nsfw = 1 THEN 1 ELSE 0 END) as nsfw_count
+                FROM activities 
+                WHERE timestamp_epoch >= ? AND timestamp_epoch < ?
+                GROUP BY activity_type
+            """, _day_range(date))
+            return _fetch_dicts(cursor)
+    
     def get_hourly_breakdown(self, date: str = None) -> List[Dict[str, Any]]:
         """
         Get hourly activity breakdown for a date.
@@ -584,33 +1190,26 @@ class Database:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        with self.get_cursor() as cursor:
+        with self.get_read_cursor() as cursor:
             cursor.execute("""
                 SELECT 
-                    strftime('%H', timestamp) as hour,
+                    printf('%02d', timestamp_epoch / 3600 % 24) as hour,
                     activity_type,
                     SUM(duration) as total_time,
                     COUNT(*) as session_count
                 FROM activities 
-                WHERE date(timestamp) = ?
-                GROUP BY strftime('%H', timestamp), activity_type
+                WHERE timestamp_epoch >= ? AND timestamp_epoch < ?
+                GROUP BY hour, activity_type
                 ORDER BY hour
-            """, (date,))
-            return [dict(row) for row in cursor.fetchall()]
+            """, _day_range(date))
+            return _fetch_dicts(cursor)
     
     # ==================== Focus Sessions ====================
     
     def insert_focus_session(self, session: FocusSession) -> int:
         """Insert a new focus session."""
-        data = session.to_dict()
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['?' for _ in data])
-        
-        with self.get_cursor() as cursor:
-            cursor.execute(
-                f"INSERT INTO focus_sessions ({columns}) VALUES ({placeholders})",
-                list(data.values())
-            )
+        with self.get_write_cursor() as cursor:
+            cursor.execute(_SQL_INSERT_FOCUS_SESSION, session.to_row_tuple())
             return cursor.lastrowid
     
     def update_focus_session(self, session_id: int, **kwargs):
@@ -618,14 +1217,10 @@ class Database:
         if not kwargs:
             return
         
-        set_clause = ', '.join([f"{k} = ?" for k in kwargs.keys()])
         values = list(kwargs.values()) + [session_id]
         
-        with self.get_cursor() as cursor:
-            cursor.execute(
-                f"UPDATE focus_sessions SET {set_clause} WHERE id = ?",
-                values
-            )
+        with self.get_write_cursor() as cursor:
+            cursor.execute(_focus_session_update_sql(tuple(kwargs)), values)
     
     def get_focus_sessions(self, date: str = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Get focus sessions for a date."""
@@ -639,34 +1234,53 @@ class Database:
         query += " ORDER BY start_time DESC LIMIT ?"
         params.append(limit)
         
-        with self.get_cursor() as cursor:
+        with self.get_read_cursor() as cursor:
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return _fetch_dicts(cursor)
     
     # ==================== Settings ====================
     
     def get_setting(self, key: str, default: Any = None) -> Any:
-        """Get a setting value."""
-        with self.get_cursor() as cursor:
-            cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-            row = cursor.fetchone()
-            if row:
-                try:
-                    return json.loads(row['value'])
-                except (json.JSONDecodeError, TypeError):
-                    return row['value']
-        return default
+        """
+        Get a setting value.
+        
+        All settings are loaded and decoded on first use and then served
+        from memory; set_setting() keeps the cache current.
+        """
+        if not self._settings_loaded:
+            self._load_settings()
+        
+        if key not in self._settings_cache:
+            return default
+        
+        value = self._settings_cache[key]
+        # Hand out copies of containers so callers can't mutate the cache
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
     
     def set_setting(self, key: str, value: Any):
         """Set a setting value."""
-        if not isinstance(value, str):
-            value = json.dumps(value)
+        value = _encode_setting(value)
         
-        with self.get_cursor() as cursor:
-            cursor.execute(
-                "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, ?)",
-                (key, value, datetime.now().isoformat())
-            )
+        with self._write_lock:
+            with self.get_write_cursor() as cursor:
+                cursor.execute(_SQL_SET_SETTING, (key, value, datetime.now().isoformat()))
+            if self._settings_loaded:
+                self._settings_cache[key] = _decode_setting(value)
+    
+    def _load_settings(self):
+        """Read every setting into the in-memory cache."""
+        # Same lock as set_setting(), so a concurrent write can't be lost
+        with self._write_lock:
+            if self._settings_loaded:
+                return
+            with self.get_read_cursor() as cursor:
+                cursor.execute(_SQL_ALL_SETTINGS)
+                self._settings_cache = {
+                    row['key']: _decode_setting(row['value']) for row in cursor.fetchall()
+                }
+            self._settings_loaded = True
     
     # ==================== Maintenance ====================
     
@@ -681,23 +1295,32 @@ class Database:
             Number of deleted records
         """
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        cutoff_epoch = _day_range(cutoff_date)[0]
         
-        with self.get_cursor() as cursor:
-            cursor.execute("DELETE FROM activities WHERE date(timestamp) < ?", (cutoff_date,))
+        # All deletes share one transaction (and one WAL sync)
+        with self.get_write_cursor() as cursor:
+            cursor.execute("DELETE FROM activities WHERE timestamp_epoch < ?", (cutoff_epoch,))
             deleted = cursor.rowcount
             
             cursor.execute("DELETE FROM daily_stats WHERE date < ?", (cutoff_date,))
             cursor.execute("DELETE FROM app_usage WHERE date < ?", (cutoff_date,))
             cursor.execute("DELETE FROM website_usage WHERE date < ?", (cutoff_date,))
             cursor.execute("DELETE FROM content_summary WHERE date < ?", (cutoff_date,))
-            cursor.execute("DELETE FROM focus_sessions WHERE date(start_time) < ?", (cutoff_date,))
+            cursor.execute("DELETE FROM focus_sessions WHERE start_time < ?", (cutoff_date,))
+        
+        # Return freed pages to the filesystem without rewriting the whole file
+        # (only effective on databases created with auto_vacuum=INCREMENTAL).
+        # executescript() steps the pragma to completion; execute() would
+        # free a single page.
+        with self.get_write_cursor() as cursor:
+            cursor.executescript("PRAGMA incremental_vacuum;")
         
         logger.info(f"Cleaned up {deleted} old activity records (older than {days} days)")
         return deleted
     
     def vacuum(self):
         """Vacuum the database to reclaim space."""
-        with self.get_cursor() as cursor:
+        with self.get_write_cursor() as cursor:
             cursor.execute("VACUUM")
         logger.info("Database vacuumed")
     
@@ -715,12 +1338,17 @@ class Database:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = f"{self.db_path}.backup_{timestamp}"
         
-        # Close connections before backup
-        if hasattr(self._local, 'connection') and self._local.connection:
-            self._local.connection.close()
-            self._local.connection = None
+        # Flush the WAL into the main file so the copy starts from the latest state
+        with self.get_write_cursor() as cursor:
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
         
-        shutil.copy2(self.db_path, backup_path)
+        # Online backup: copies pages incrementally while writers keep going
+        destination = sqlite3.connect(backup_path)
+        try:
+            with destination:
+                self._get_reader().backup(destination, pages=1000, sleep=0.01)
+        finally:
+            destination.close()
         logger.info(f"Database backed up to {backup_path}")
         return backup_path
     
@@ -742,27 +1370,55 @@ class Database:
         Returns:
             Dict mapping table name to record count
         """
-        counts = {}
-        tables = ['activities', 'daily_stats', 'app_usage', 'website_usage', 'content_summary', 'focus_sessions']
-        
-        with self.get_cursor() as cursor:
-            for table in tables:
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    counts[table] = cursor.fetchone()[0]
-                except sqlite3.OperationalError:
-                    counts[table] = 0
+        with self.get_read_cursor() as cursor:
+            try:
+                cursor.execute("SELECT table_name, n FROM row_counts")
+                tracked = {row['table_name']: row['n'] for row in cursor.fetchall()}
+            except sqlite3.OperationalError:
+                tracked = {}
+            
+            counts = {}
+            for table in COUNTED_TABLES:
+                if table in tracked:
+                    counts[table] = tracked[table]
+                else:
+                    counts[table] = self._estimate_row_count(cursor, table)
         
         return counts
     
+    def _estimate_row_count(self, cursor, table: str) -> int:
+        """Row count from ANALYZE statistics, or COUNT(*) if there are none."""
+        try:
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (table,))
+            row = cursor.fetchone()
+            if row and row['stat']:
+                return int(row['stat'].split()[0])
+        except (sqlite3.OperationalError, ValueError):
+            pass
+        
+        try:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            return cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0
+    
     def close(self):
-        """Close database connection."""
-        if hasattr(self._local, 'connection') and self._local.connection:
+        """Close this thread's reader and the writer connection."""
+        if getattr(self._local, 'reader', None) is not None:
             try:
-                self._local.connection.close()
+                self._local.reader.close()
             except Exception as e:
                 logger.warning(f"Error closing database: {e}")
-            self._local.connection = None
+            self._local.reader = None
+        
+        # Writer last, so it can checkpoint the WAL on close
+        with self._write_lock:
+            if self._writer is not None:
+                try:
+                    self._writer.close()
+                except Exception as e:
+                    logger.warning(f"Error closing database: {e}")
+                self._writer = None
         logger.debug("Database connection closed")
     
     def __enter__(self):
@@ -775,6 +1431,100 @@ class Database:
         return False
 
 
+class FlushBuffer:
+    """
+    Buffers activities in memory and writes them in batches.
+    
+    Each flush is a single executemany inside one BEGIN IMMEDIATE
+    transaction, so a snapshot every 30 seconds costs one commit per
+    batch instead of one per row. Pending rows are flushed at exit.
+    """
+    
+    def __init__(self, database: Database, max_size: int = 20, flush_interval: float = 600):
+        """
+        Initialize FlushBuffer.
+        
+        Args:
+            database: Database to write to
+            max_size: Number of buffered activities that triggers a flush
+            flush_interval: Seconds after which pending activities are flushed
+        """
+        self.database = database
+        self.max_size = max(1, max_size)
+        self.flush_interval = flush_interval
+        
+        self._buffer: deque = deque()
+        # _buffer_lock guards the deque itself (held only briefly);
+        # _lock serializes flushes so a slow write never blocks add()
+        self._buffer_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        
+        atexit.register(self.flush)
+    
+    def __len__(self) -> int:
+        return len(self._buffer)
+    
+    def add(self, activity: Activity) -> int:
+        """
+        Buffer an activity, flushing if the buffer is full or stale.
+        
+        Args:
+            activity: Activity to write
+            
+        Returns:
+            Number of activities written (0 if only buffered)
+        """
+        with self._buffer_lock:
+            self._buffer.append(activity)
+            pending = len(self._buffer)
+        
+        if pending >= self.max_size:
+            return self.flush()
+        return self.flush_if_due()
+    
+    def flush_if_due(self) -> int:
+        """
+        Flush if flush_interval has elapsed since the last flush.
+        
+        Call periodically so buffered rows are written even when no
+        new activities arrive (e.g. while tracking is paused).
+        
+        Returns:
+            Number of activities written
+        """
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            return self.flush()
+        return 0
+    
+    def flush(self) -> int:
+        """
+        Write all buffered activities in one transaction.
+        
+        Returns:
+            Number of activities written
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            with self._buffer_lock:
+                if not self._buffer:
+                    return 0
+                activities, self._buffer = self._buffer, deque()
+            
+            try:
+                return self.database.insert_activities(list(activities))
+            except Exception:
+                # Keep the rows, ahead of anything added meanwhile
+                with self._buffer_lock:
+                    self._buffer.extendleft(reversed(activities))
+                raise
+    
+    def close(self):
+        """Flush pending activities and stop flushing at exit."""
+        self.flush()
+        atexit.unregister(self.flush)
+
+
 # ============================================================
 # Singleton Instance Management
 # ============================================================
@@ -3,11 +3,130 @@ Advanced Content Tracker - Database Models
 Defines the schema for all database tables using dataclasses.
 """
 
+import sys
+import json
+import calendar
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 from enum import Enum
 
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+def wall_clock_epoch(value: Any) -> Optional[int]:
+    """
+    Seconds since the epoch for a timestamp's wall-clock time.
+    
+    The naive local time is read as if it were UTC, matching SQLite's
+    strftime('%s', timestamp), so day and hour boundaries are plain
+    integer arithmetic.
+    
+    Args:
+        value: datetime or ISO 8601 string
+        
+    Returns:
+        Epoch seconds, or None if the value can't be parsed
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return calendar.timegm(value.timetuple())
+
+
+# extracted_text is truncated to this length at ingestion (see the
+# CHECK constraint on activities.extracted_text)
+EXTRACTED_TEXT_MAX_LENGTH = 1000
+
+# extracted_text longer than this is stored zstd-compressed (if available)
+COMPRESS_MIN_LENGTH = 256
+
+# zstandard (de)compressor objects must not be shared between threads
+_zstd_local = threading.local()
+
+
+def compress_text(text: str) -> Tuple[str, Optional[bytes]]:
+    """
+    Split text into its (plain, compressed) storage columns.
+    
+    Args:
+        text: Text to store
+        
+    Returns:
+        ("", zstd bytes) when compression is available and pays off,
+        otherwise (text, None)
+    """
+    if not HAS_ZSTD or len(text) <= COMPRESS_MIN_LENGTH:
+        return text, None
+    
+    compressor = getattr(_zstd_local, 'compressor', None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=3)
+    
+    raw = text.encode('utf-8')
+    packed = compressor.compress(raw)
+    if len(packed) >= len(raw):
+        return text, None
+    return "", packed
+
+
+def decompress_text(text: Optional[str], packed: Optional[bytes]) -> Optional[str]:
+    """
+    Inverse of compress_text().
+    
+    Also registered as the SQL function activity_text(plain, packed) so
+    triggers and LIKE search see the original text.
+    """
+    if not packed:
+        return text
+    if not HAS_ZSTD:
+        return text
+    
+    decompressor = getattr(_zstd_local, 'decompressor', None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(packed).decode('utf-8')
+
+
+# activities columns written on insert, in Activity.to_row_tuple() order
+ACTIVITY_COLUMNS = (
+    'timestamp', 'app_name', 'window_title', 'process_name', 'process_id',
+    'website', 'url', 'content_type', 'content_category',
+    'content_description', 'content_title', 'activity_type',
+    'is_productive', 'productivity_score', 'detection_method',
+    'confidence', 'nsfw_score', 'is_nsfw', 'duration', 'screenshot_path',
+    'is_idle', 'is_excluded', 'extracted_text', 'extracted_text_zstd',
+    'timestamp_epoch'
+)
+
+# Pre-sized, insertion-ordered base for Activity.to_dict(); copying it is
+# cheaper than building the dict literal key by key. The dict carries the
+# plain text; only to_row_tuple() compresses it for storage.
+_ACTIVITY_DICT_TEMPLATE = dict.fromkeys(
+    name for name in ACTIVITY_COLUMNS if name != 'extracted_text_zstd'
+)
+
+INSERT_ACTIVITY_SQL = (
+    "INSERT INTO activities (" + ", ".join(ACTIVITY_COLUMNS) + ") "
+    "VALUES (" + ", ".join("?" * len(ACTIVITY_COLUMNS)) + ")"
+)
+
+# Bits of Activity.flags. The boolean columns stay separate in SQLite,
+# whose record format stores 0/1 without any payload bytes.
+FLAG_PRODUCTIVE = 1
+FLAG_NSFW = 2
+FLAG_IDLE = 4
+FLAG_EXCLUDED = 8
+
 
 class ActivityType(Enum):
     """High-level activity classification."""
@@ -22,6 +141,11 @@ class ActivityType(Enum):
     NEUTRAL = "neutral"
     IDLE = "idle"
     UNKNOWN = "unknown"
+    
+    @classmethod
+    def from_value(cls, value: str) -> 'ActivityType':
+        """Look up a member by value, falling back to UNKNOWN."""
+        return cls._VALUE_TO_MEMBER.get(value, cls.UNKNOWN)
 
 
 class ContentType(Enum):
@@ -40,6 +164,11 @@ class ContentType(Enum):
     TERMINAL = "terminal"
     BROWSER = "browser"
     UNKNOWN = "unknown"
+    
+    @classmethod
+    def from_value(cls, value: str) -> 'ContentType':
+        """Look up a member by value, falling back to UNKNOWN."""
+        return cls._VALUE_TO_MEMBER.get(value, cls.UNKNOWN)
 
 
 class DetectionMethod(Enum):
@@ -51,9 +180,24 @@ class DetectionMethod(Enum):
     IMAGE = "image"
     COMBINED = "combined"
     MANUAL = "manual"
+    
+    @classmethod
+    def from_value(cls, value: str) -> 'DetectionMethod':
+        """Look up a member by value, falling back to RULES (the Activity default)."""
+        return cls._VALUE_TO_MEMBER.get(value, cls.RULES)
+
+
+# value -> member maps for from_value(); a dict hit instead of Enum.__call__
+for _enum in (ActivityType, ContentType, DetectionMethod):
+    _enum._VALUE_TO_MEMBER = {member.value: member for member in _enum}
+del _enum
+
+
+# Slotted dataclasses need Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Activity:
     """
     Main activity record - represents a single tracking snapshot.
@@ -107,33 +251,66 @@ class Activity:
     # OCR extracted text (for debugging/analysis, truncated)
     extracted_text: str = ""
     
+    # Database insert columns, in to_row_tuple() order
+    COLUMNS = ACTIVITY_COLUMNS
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database insertion."""
-        return {
-            'timestamp': self.timestamp.isoformat() if isinstance(self.timestamp, datetime) else self.timestamp,
-            'app_name': self.app_name or "",
-            'window_title': self.window_title or "",
-            'process_name': self.process_name or "",
-            'process_id': self.process_id,
-            'website': self.website or "",
-            'url': self.url or "",
-            'content_type': self.content_type or "unknown",
-            'content_category': self.content_category or "",
-            'content_description': self.content_description or "",
-            'content_title': self.content_title or "",
-            'activity_type': self.activity_type or "unknown",
-            'is_productive': self.is_productive,
-            'productivity_score': self.productivity_score,
-            'detection_method': self.detection_method or "rules",
-            'confidence': self.confidence,
-            'nsfw_score': self.nsfw_score,
-            'is_nsfw': self.is_nsfw,
-            'duration': self.duration,
-            'screenshot_path': self.screenshot_path or "",
-            'is_idle': self.is_idle,
-            'is_excluded': self.is_excluded,
-            'extracted_text': (self.extracted_text or "")[:1000]  # Limit text length
-        }
+        d = _ACTIVITY_DICT_TEMPLATE.copy()
+        d['timestamp'] = self.timestamp.isoformat() if isinstance(self.timestamp, datetime) else self.timestamp
+        d['app_name'] = self.app_name or ""
+        d['window_title'] = self.window_title or ""
+        d['process_name'] = self.process_name or ""
+        d['process_id'] = self.process_id
+        d['website'] = self.website or ""
+        d['url'] = self.url or ""
+        d['content_type'] = self.content_type or "unknown"
+        d['content_category'] = self.content_category or ""
+        d['content_description'] = self.content_description or ""
+        d['content_title'] = self.content_title or ""
+        d['activity_type'] = self.activity_type or "unknown"
+        d['is_productive'] = self.is_productive
+        d['productivity_score'] = self.productivity_score
+        d['detection_method'] = self.detection_method or "rules"
+        d['confidence'] = self.confidence
+        d['nsfw_score'] = self.nsfw_score
+        d['is_nsfw'] = self.is_nsfw
+        d['duration'] = self.duration
+        d['screenshot_path'] = self.screenshot_path or ""
+        d['is_idle'] = self.is_idle
+        d['is_excluded'] = self.is_excluded
+        d['extracted_text'] = (self.extracted_text or "")[:EXTRACTED_TEXT_MAX_LENGTH]
+        d['timestamp_epoch'] = wall_clock_epoch(self.timestamp)
+        return d
+    
+    def to_row_tuple(self) -> Tuple[Any, ...]:
+        """Convert to a tuple of insert parameters in COLUMNS order."""
+        return (
+            self.timestamp.isoformat() if isinstance(self.timestamp, datetime) else self.timestamp,
+            self.app_name or "",
+            self.window_title or "",
+            self.process_name or "",
+            self.process_id,
+            self.website or "",
+            self.url or "",
+            self.content_type or "unknown",
+            self.content_category or "",
+            self.content_description or "",
+            self.content_title or "",
+            self.activity_type or "unknown",
+            self.is_productive,
+            self.productivity_score,
+            self.detection_method or "rules",
+            self.confidence,
+            self.nsfw_score,
+            self.is_nsfw,
+            self.duration,
+            self.screenshot_path or "",
+            self.is_idle,
+            self.is_excluded,
+            *compress_text((self.extracted_text or "")[:EXTRACTED_TEXT_MAX_LENGTH]),
+            wall_clock_epoch(self.timestamp)
+        )
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Activity':
@@ -145,10 +322,35 @@ class Activity:
             except (ValueError, TypeError):
                 data['timestamp'] = datetime.now()
         
+        # NULL text columns (e.g. added by ALTER TABLE) become their defaults
+        for name, default in cls._STR_DEFAULTS:
+            if name in data and data[name] is None:
+                data[name] = default
+        
+        # Rows with no extra columns go straight to the constructor
+        if cls._FIELD_NAMES.issuperset(data):
+            return cls(**data)
+        
         # Filter to only valid fields
-        valid_fields = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        valid_fields = {k: v for k, v in data.items() if k in cls._FIELD_NAMES}
         return cls(**valid_fields)
     
+    @classmethod
+    def from_row_fast(cls, row: Sequence[Any]) -> 'Activity':
+        """
+        Create Activity from a plain row tuple in _FIELD_LIST order.
+        
+        Positional construction skips from_dict()'s filtering and keyword
+        unpacking. Columns beyond the dataclass fields are ignored.
+        """
+        timestamp = row[1]
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.fromisoformat(timestamp)
+            except ValueError:
+                timestamp = datetime.now()
+        return cls(row[0], timestamp, *row[2:len(cls._FIELD_LIST)])
+    
     @classmethod
     def from_row(cls, row) -> 'Activity':
         """Create Activity from SQLite Row object."""
@@ -156,6 +358,23 @@ class Activity:
             return None
         return cls.from_dict(dict(row))
     
+    @property
+    def flags(self) -> int:
+        """Boolean fields packed into FLAG_* bits."""
+        return (
+            (FLAG_PRODUCTIVE if self.is_productive else 0) |
+            (FLAG_NSFW if self.is_nsfw else 0) |
+            (FLAG_IDLE if self.is_idle else 0) |
+            (FLAG_EXCLUDED if self.is_excluded else 0)
+        )
+    
+    @flags.setter
+    def flags(self, value: int):
+        self.is_productive = bool(value & FLAG_PRODUCTIVE)
+        self.is_nsfw = bool(value & FLAG_NSFW)
+        self.is_idle = bool(value & FLAG_IDLE)
+        self.is_excluded = bool(value & FLAG_EXCLUDED)
+    
     def __str__(self) -> str:
         return f"Activity({self.app_name}: {self.content_description[:50]})"
     
@@ -163,7 +382,15 @@ class Activity:
         return f"Activity(id={self.id}, app={self.app_name}, type={self.activity_type})"
 
 
-@dataclass
+# Field lookups for from_dict() and from_row_fast(), computed once
+Activity._FIELD_NAMES = frozenset(Activity.__dataclass_fields__)
+Activity._FIELD_LIST = tuple(Activity.__dataclass_fields__)
+Activity._STR_DEFAULTS = tuple(
+    (name, f.default) for name, f in Activity.__dataclass_fields__.items() if f.type is str
+)
+
+
+@dataclass(**_SLOTS)
 class ContentSummary:
     """
     Aggregated content type summary for a specific date.
@@ -193,7 +420,7 @@ class ContentSummary:
         return cls(**valid_fields)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DailyStats:
     """
     Daily statistics summary.
@@ -276,7 +503,7 @@ class DailyStats:
         return (distraction / self.total_tracked_time) * 100
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AppUsage:
     """
     Application usage tracking summary.
@@ -304,7 +531,7 @@ class AppUsage:
         return cls(**valid_fields)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WebsiteUsage:
     """
     Website usage tracking summary.
@@ -315,7 +542,7 @@ class WebsiteUsage:
     website: str = ""
     total_time: int = 0  # seconds
     visit_count: int = 0
-    content_categories: str = ""  # JSON list of categories
+    content_categories: List[str] = field(default_factory=list)  # from website_usage_categories
     productivity_score: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
@@ -324,17 +551,21 @@ class WebsiteUsage:
             'website': self.website,
             'total_time': self.total_time,
             'visit_count': self.visit_count,
-            'content_categories': self.content_categories,
+            'content_categories': list(self.content_categories),
             'productivity_score': self.productivity_score
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WebsiteUsage':
         valid_fields = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        categories = valid_fields.get('content_categories')
+        if isinstance(categories, str):
+            # Legacy rows stored a JSON list in website_usage.content_categories
+            valid_fields['content_categories'] = json.loads(categories) if categories else []
         return cls(**valid_fields)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FocusSession:
     """
     Focus mode session tracking.
@@ -350,6 +581,12 @@ class FocusSession:
     blocked_attempts: int = 0  # Number of blocked site/app attempts
     notes: str = ""
     
+    # Database columns, in to_dict() order
+    COLUMNS = (
+        'start_time', 'end_time', 'planned_duration', 'actual_duration',
+        'completed', 'distractions', 'blocked_attempts', 'notes'
+    )
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'start_time': self.start_time.isoformat() if isinstance(self.start_time, datetime) else self.start_time,
@@ -362,6 +599,19 @@ class FocusSession:
             'notes': self.notes
         }
     
+    def to_row_tuple(self) -> Tuple[Any, ...]:
+        """Convert to a tuple of insert parameters in COLUMNS order."""
+        return (
+            self.start_time.isoformat() if isinstance(self.start_time, datetime) else self.start_time,
+            self.end_time.isoformat() if isinstance(self.end_time, datetime) and self.end_time else None,
+            self.planned_duration,
+            self.actual_duration,
+            self.completed,
+            self.distractions,
+            self.blocked_attempts,
+            self.notes
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FocusSession':
         # Handle datetime conversion
@@ -432,18 +682,29 @@ CREATE TABLE IF NOT EXISTS activities (
     -- Metadata
     is_idle BOOLEAN DEFAULT 0,
     is_excluded BOOLEAN DEFAULT 0,
-    extracted_text TEXT DEFAULT ''
+    extracted_text TEXT DEFAULT '' CHECK(length(extracted_text) <= 1000),
+    extracted_text_zstd BLOB,  -- zstd-compressed extracted_text (extracted_text is then '')
+    timestamp_epoch INTEGER  -- wall-clock seconds (timestamp read as UTC)
 );
 
 -- Indexes for common queries on activities table
 CREATE INDEX IF NOT EXISTS idx_activities_timestamp ON activities(timestamp);
-CREATE INDEX IF NOT EXISTS idx_activities_date ON activities(date(timestamp));
-CREATE INDEX IF NOT EXISTS idx_activities_app ON activities(app_name);
-CREATE INDEX IF NOT EXISTS idx_activities_website ON activities(website);
 CREATE INDEX IF NOT EXISTS idx_activities_activity_type ON activities(activity_type);
-CREATE INDEX IF NOT EXISTS idx_activities_content_type ON activities(content_type);
-CREATE INDEX IF NOT EXISTS idx_activities_is_productive ON activities(is_productive);
-CREATE INDEX IF NOT EXISTS idx_activities_is_nsfw ON activities(is_nsfw);
+
+-- Partial indexes for per-app/per-site lookups and the rare NSFW rows
+CREATE INDEX IF NOT EXISTS idx_activities_app_ts ON activities(app_name, timestamp) WHERE app_name != '';
+CREATE INDEX IF NOT EXISTS idx_activities_website_ts ON activities(website, timestamp) WHERE website != '';
+CREATE INDEX IF NOT EXISTS idx_activities_nsfw_ts ON activities(timestamp) WHERE is_nsfw = 1;
+
+-- Superseded indexes: date() by timestamp_epoch, app/website by the partial
+-- indexes above; booleans and content_type are too unselective to pay
+-- for their upkeep on every insert
+DROP INDEX IF EXISTS idx_activities_date;
+DROP INDEX IF EXISTS idx_activities_app;
+DROP INDEX IF EXISTS idx_activities_website;
+DROP INDEX IF EXISTS idx_activities_content_type;
+DROP INDEX IF EXISTS idx_activities_is_productive;
+DROP INDEX IF EXISTS idx_activities_is_nsfw;
 
 -- Content type summary table (aggregated)
 CREATE TABLE IF NOT EXISTS content_summary (
@@ -477,9 +738,9 @@ CREATE TABLE IF NOT EXISTS daily_stats (
     neutral_time INTEGER DEFAULT 0,
     idle_time INTEGER DEFAULT 0,
     
-    -- Scores
-    productivity_score REAL DEFAULT 0.0,
-    focus_score REAL DEFAULT 0.0,
+    -- Scores (0-100, stored x10)
+    productivity_score_x10 INTEGER DEFAULT 0,
+    focus_score_x10 INTEGER DEFAULT 0,
     
     -- Counts
     total_sessions INTEGER DEFAULT 0,
@@ -502,7 +763,7 @@ CREATE TABLE IF NOT EXISTS app_usage (
     app_name TEXT NOT NULL,
     total_time INTEGER DEFAULT 0,
     session_count INTEGER DEFAULT 0,
-    productivity_score REAL DEFAULT 0.0,
+    productivity_score_x1000 INTEGER DEFAULT 0,  -- -1.0 to 1.0, stored x1000
     UNIQUE(date, app_name)
 );
 
@@ -516,14 +777,22 @@ CREATE TABLE IF NOT EXISTS website_usage (
     website TEXT NOT NULL,
     total_time INTEGER DEFAULT 0,
     visit_count INTEGER DEFAULT 0,
-    content_categories TEXT DEFAULT '[]',
-    productivity_score REAL DEFAULT 0.0,
+    productivity_score_x1000 INTEGER DEFAULT 0,  -- -1.0 to 1.0, stored x1000
     UNIQUE(date, website)
 );
 
 CREATE INDEX IF NOT EXISTS idx_website_usage_date ON website_usage(date);
 CREATE INDEX IF NOT EXISTS idx_website_usage_website ON website_usage(website);
 
+-- Content categories seen per website_usage row
+CREATE TABLE IF NOT EXISTS website_usage_categories (
+    website_usage_id INTEGER NOT NULL REFERENCES website_usage(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    PRIMARY KEY (website_usage_id, category)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_website_usage_categories_category ON website_usage_categories(category);
+
 -- Focus sessions table
 CREATE TABLE IF NOT EXISTS focus_sessions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -543,7 +812,7 @@ CREATE INDEX IF NOT EXISTS idx_focus_sessions_date ON focus_sessions(date(start_
 -- Settings/preferences table (key-value store)
 CREATE TABLE IF NOT EXISTS settings (
     key TEXT PRIMARY KEY,
-    value TEXT,
+    value BLOB,  -- text, JSON, or msgpack bytes
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -551,6 +820,190 @@ CREATE TABLE IF NOT EXISTS settings (
 INSERT OR IGNORE INTO settings (key, value) VALUES ('schema_version', '1');
 """
 
+# Recomputes one daily_stats row from that day's activities in a single
+# statement. Parameters: :date (YYYY-MM-DD) and the day's timestamp_epoch
+# range [:start, :end).
+ROLLUP_DAILY_SQL = """
+WITH day AS (
+    SELECT activity_type, app_name, website, content_category, duration, is_nsfw
+    FROM activities
+    WHERE timestamp_epoch >= :start AND timestamp_epoch < :end
+),
+totals AS (
+    SELECT
+        COALESCE(SUM(duration), 0) AS total_tracked_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'productive' THEN duration END), 0) AS productive_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'educational' THEN duration END), 0) AS educational_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'entertainment' THEN duration END), 0) AS entertainment_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'social_media' THEN duration END), 0) AS social_media_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'gaming' THEN duration END), 0) AS gaming_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'shopping' THEN duration END), 0) AS shopping_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'news' THEN duration END), 0) AS news_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'adult' THEN duration END), 0) AS adult_content_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'neutral' THEN duration END), 0) AS neutral_time,
+        COALESCE(SUM(CASE WHEN activity_type = 'idle' THEN duration END), 0) AS idle_time,
+        COUNT(*) AS total_sessions,
+        COUNT(DISTINCT app_name) AS app_switches,
+        COUNT(DISTINCT website) AS website_visits,
+        COALESCE(SUM(CASE WHEN is_nsfw = 1 THEN 1 ELSE 0 END), 0) AS nsfw_detections
+    FROM day
+)
+INSERT OR REPLACE INTO daily_stats (
+    date, total_tracked_time, productive_time, educational_time,
+    entertainment_time, social_media_time, gaming_time, shopping_time,
+    news_time, adult_content_time, neutral_time, idle_time,
+    productivity_score_x10, focus_score_x10, total_sessions, app_switches,
+    website_visits, nsfw_detections, top_app, top_website, top_content_category
+)
+SELECT
+    :date, total_tracked_time, productive_time, educational_time, entertainment_time, social_media_time, gaming_time, shopping_time, news_time, adult_content_time, neutral_time, idle_time,
+    CASE WHEN total_tracked_time > 0
+         THEN CAST(round(MIN(100.0, MAX(0.0,
+                  (productive_time + educational_time * 0.8) * 100.0 / total_tracked_time)) * 10) AS INTEGER)
+         ELSE 0 END,
+    0,  -- focus_score: calculated separately
+    total_sessions, app_switches, website_visits, nsfw_detections,
+    COALESCE((SELECT app_name FROM day WHERE app_name != ''
+              GROUP BY app_name ORDER BY SUM(duration) DESC, app_name LIMIT 1), ''),
+    COALESCE((SELECT website FROM day WHERE website != ''
+              GROUP BY website ORDER BY SUM(duration) DESC, website LIMIT 1), ''),
+    COALESCE((SELECT content_category FROM day WHERE content_category != ''
+              GROUP BY content_category ORDER BY SUM(duration) DESC, content_category LIMIT 1), '')
+FROM totals
+"""
+
+# Pragmas for every connection (writer and readers), run once at open
+PRAGMA_SQL = """
+PRAGMA cache_size=-65536;      -- 64 MiB, independent of page size
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;    -- 256 MiB
+PRAGMA busy_timeout=30000;
+"""
+
+# Writer-only pragmas. page_size and auto_vacuum only take effect on a new
+# database, so they must run before anything (including the WAL switch)
+# writes the header.
+WRITER_PRAGMA_SQL = """
+PRAGMA page_size=8192;
+PRAGMA auto_vacuum=INCREMENTAL;
+PRAGMA foreign_keys=ON;
+PRAGMA synchronous=NORMAL;
+PRAGMA secure_delete=OFF;      -- no zero-filling of freed pages
+PRAGMA recursive_triggers=ON;  -- INSERT OR REPLACE deletions fire the row_counts triggers
+"""
+
+# Writer pragmas for WAL mode (Database(wal_mode=True))
+WAL_PRAGMA_SQL = """
+PRAGMA journal_mode=WAL;
+PRAGMA wal_autocheckpoint=1000;
+"""
+
+# Tables whose row counts are kept in row_counts by triggers
+COUNTED_TABLES = (
+    'activities', 'daily_stats', 'app_usage', 'website_usage',
+    'content_summary', 'focus_sessions'
+)
+
+# Run inside one transaction so the initial COUNT(*) and the triggers agree
+ROW_COUNTS_SQL = """
+CREATE TABLE IF NOT EXISTS row_counts (
+    table_name TEXT PRIMARY KEY,
+    n INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+""" + "".join(f"""
+INSERT OR IGNORE INTO row_counts (table_name, n) SELECT '{table}', COUNT(*) FROM {table};
+
+CREATE TRIGGER IF NOT EXISTS {table}_count_insert AFTER INSERT ON {table} BEGIN
+    UPDATE row_counts SET n = n + 1 WHERE table_name = '{table}';
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_count_delete AFTER DELETE ON {table} BEGIN
+    UPDATE row_counts SET n = n - 1 WHERE table_name = '{table}';
+END;
+""" for table in COUNTED_TABLES)
+
+# Summary scores stored as scaled integers, as {table: {column: scale}}.
+# The stored column is named "<column>_x<scale>"; Database converts back
+# to floats when reading.
+SCORE_SCALES = {
+    'daily_stats': {'productivity_score': 10, 'focus_score': 10},
+    'app_usage': {'productivity_score': 1000},
+    'website_usage': {'productivity_score': 1000},
+}
+
+# Columns added to activities after the initial schema, with their
+# declarations; Database adds any that an existing table is missing
+ACTIVITY_ADDED_COLUMNS = {
+    'timestamp_epoch': 'INTEGER',
+    'extracted_text_zstd': 'BLOB',
+}
+
+# Wall-clock epoch column. Run after SCHEMA_SQL, once the column exists
+# (Database adds it to databases created before it was introduced):
+# backfills rows written by older versions and indexes it for the
+# per-day aggregations (index-only scans).
+EPOCH_SCHEMA_SQL = """
+UPDATE activities
+SET timestamp_epoch = CAST(strftime('%s', timestamp) AS INTEGER)
+WHERE timestamp_epoch IS NULL;
+
+DROP INDEX IF EXISTS idx_activities_ts_type;
+CREATE INDEX IF NOT EXISTS idx_activities_epoch_type ON activities(timestamp_epoch, activity_type, duration, is_nsfw);
+"""
+
+# Full-text index over the searchable activity columns.
+# Kept separate from SCHEMA_SQL because FTS5 is an optional SQLite
+# compile-time feature; Database falls back to LIKE search without it.
+FTS_SCHEMA_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS activities_fts USING fts5(
+    content_description, content_title, extracted_text, window_title, app_name,
+    content='activities', content_rowid='id', tokenize='porter unicode61'
+);
+
+-- Older versions kept the sync triggers in the database file itself
+DROP TRIGGER IF EXISTS main.activities_fts_insert;
+DROP TRIGGER IF EXISTS main.activities_fts_delete;
+DROP TRIGGER IF EXISTS main.activities_fts_update;
+"""
+
+# Keeps activities_fts in sync with activities. The triggers call
+# activity_text(plain, packed), a Python function only Database registers,
+# so they are TEMP triggers created on Database's writer connection: other
+# tools (sqlite3 CLI, restored backups) can still modify activities, at the
+# cost of the search index missing their changes until
+# Database.rebuild_search_index() is run.
+FTS_TRIGGERS_SQL = """
+CREATE TEMP TRIGGER IF NOT EXISTS activities_fts_insert AFTER INSERT ON main.activities BEGIN
+    INSERT INTO activities_fts(rowid, content_description, content_title, extracted_text, window_title, app_name)
+    VALUES (new.id, new.content_description, new.content_title,
+            activity_text(new.extracted_text, new.extracted_text_zstd), new.window_title, new.app_name);
+END;
+
+CREATE TEMP TRIGGER IF NOT EXISTS activities_fts_delete AFTER DELETE ON main.activities BEGIN
+    INSERT INTO activities_fts(activities_fts, rowid, content_description, content_title, extracted_text, window_title, app_name)
+    VALUES ('delete', old.id, old.content_description, old.content_title,
+            activity_text(old.extracted_text, old.extracted_text_zstd), old.window_title, old.app_name);
+END;
+
+CREATE TEMP TRIGGER IF NOT EXISTS activities_fts_update AFTER UPDATE ON main.activities BEGIN
+    INSERT INTO activities_fts(activities_fts, rowid, content_description, content_title, extracted_text, window_title, app_name)
+    VALUES ('delete', old.id, old.content_description, old.content_title,
+            activity_text(old.extracted_text, old.extracted_text_zstd), old.window_title, old.app_name);
+    INSERT INTO activities_fts(rowid, content_description, content_title, extracted_text, window_title, app_name)
+    VALUES (new.id, new.content_description, new.content_title,
+            activity_text(new.extracted_text, new.extracted_text_zstd), new.window_title, new.app_name);
+END;
+"""
+
+# Fills activities_fts from existing rows (used when the index is first
+# created, and after 'delete-all' when rebuilding it)
+FTS_POPULATE_SQL = """
+INSERT INTO activities_fts(rowid, content_description, content_title, extracted_text, window_title, app_name)
+SELECT id, content_description, content_title,
+       activity_text(extracted_text, extracted_text_zstd), window_title, app_name
+FROM activities
+"""
+
 # Migration queries for future schema updates
 MIGRATIONS = {
     1: """
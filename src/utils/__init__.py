@@ -2,70 +2,91 @@
 Utilities module - Configuration, logging, and helper functions.
 """
 
-from .config import (
-    Config,
-    get_config,
-    load_config,
-    MonitoringConfig,
-    DetectionConfig,
-    PerformanceConfig,
-    PrivacyConfig,
-    NotificationsConfig
-)
+import importlib
 
-from .logger import (
-    LoggerManager,
-    setup_logging,
-    get_logger,
-    ActivityLogger
-)
-
-from .helpers import (
+# Public names -> submodule. Submodules are imported on first attribute
+# access (PEP 562), so importing src.utils.config does not also pull in
+# the logger and helpers modules and their optional dependencies.
+_LAZY = {
+    # Config
+    'Config': 'config',
+    'get_config': 'config',
+    'load_config': 'config',
+    'MonitoringConfig': 'config',
+    'DetectionConfig': 'config',
+    'PerformanceConfig': 'config',
+    'PrivacyConfig': 'config',
+    'NotificationsConfig': 'config',
+    
+    # Logging
+    'LoggerManager': 'logger',
+    'setup_logging': 'logger',
+    'get_logger': 'logger',
+    'ActivityLogger': 'logger',
+    
     # URL utilities
-    extract_domain,
-    extract_youtube_video_id,
-    get_url_path,
-    hash_url,
+    'extract_domain': 'helpers',
+    'extract_youtube_video_id': 'helpers',
+    'get_url_path': 'helpers',
+    'hash_url': 'helpers',
+    'clear_url_caches': 'helpers',
     
     # Text utilities
-    clean_text,
-    extract_keywords,
-    truncate_text,
-    sanitize_filename,
-    contains_keywords,
+    'clean_text': 'helpers',
+    'extract_keywords': 'helpers',
+    'truncate_text': 'helpers',
+    'sanitize_filename': 'helpers',
+    'contains_keywords': 'helpers',
     
     # Time utilities
-    format_duration,
-    format_time_ago,
-    get_date_range,
-    is_within_hours,
+    'format_duration': 'helpers',
+    'format_time_ago': 'helpers',
+    'get_date_range': 'helpers',
+    'is_within_hours': 'helpers',
     
     # System utilities
-    get_system_info,
-    is_wayland,
-    is_x11,
-    run_command,
-    check_command_exists,
-    get_memory_usage,
+    'get_system_info': 'helpers',
+    'is_wayland': 'helpers',
+    'is_x11': 'helpers',
+    'run_command': 'helpers',
+    'check_command_exists': 'helpers',
+    'get_memory_usage': 'helpers',
     
     # File utilities
-    ensure_dir,
-    get_file_size,
-    format_size,
+    'ensure_dir': 'helpers',
+    'get_file_size': 'helpers',
+    'get_dir_file_sizes': 'helpers',
+    'format_size': 'helpers',
     
     # Decorators
-    timing,
-    retry,
-    singleton,
-    cached,
+    'timing': 'helpers',
+    'retry': 'helpers',
+    'singleton': 'helpers',
+    'cached': 'helpers',
     
     # Data utilities
-    safe_json_loads,
-    safe_json_dumps,
-    merge_dicts,
-    calculate_percentage,
-    clamp
-)
+    'safe_json_loads': 'helpers',
+    'safe_json_dumps': 'helpers',
+    'merge_dicts': 'helpers',
+    'calculate_percentage': 'helpers',
+    'clamp': 'helpers'
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    
+    value = getattr(importlib.import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     # Config
@@ -89,6 +110,7 @@ __all__ = [
     'extract_youtube_video_id',
     'get_url_path',
     'hash_url',
+    'clear_url_caches',
     
     # Text utilities
     'clean_text',
@@ -114,6 +136,7 @@ __all__ = [
     # File utilities
     'ensure_dir',
     'get_file_size',
+    'get_dir_file_sizes',
     'format_size',
     
     # Decorators
@@ -1,19 +1,64 @@
 """
 Advanced Content Tracker - Configuration Loader
-Handles loading, validating, and accessing configuration from YAML files.
+Handles loading, validating, and accessing configuration from YAML (or JSON/TOML) files.
 """
 
 import os
-import yaml
+import re
+import json
+import sys
+import copy
+import pickle
+import types
 import logging
-from typing import Any, Dict, Optional
-from pathlib import Path
-from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional
+from dataclasses import dataclass
+from functools import wraps
+
+
+try:
+    import tomllib
+    HAS_TOMLLIB = True
+except ImportError:
+    HAS_TOMLLIB = False
 
 
 logger = logging.getLogger(__name__)
 
 
+def _yaml_load(stream) -> Any:
+    """
+    Parse YAML, importing PyYAML on first use.
+    
+    Uses the libyaml-backed loader when PyYAML was built with it.
+    """
+    import yaml
+    return yaml.load(stream, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _yaml_dump(data: Any, stream):
+    """Write YAML, importing PyYAML on first use."""
+    import yaml
+    yaml.dump(data, stream, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper),
+              default_flow_style=False, sort_keys=False)
+
+
+def _parse_config(path: str, stream) -> Any:
+    """
+    Parse a config file, picking the parser from its extension.
+    
+    .json and .toml skip PyYAML entirely; anything else is read as YAML.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        return json.load(stream)
+    if ext == '.toml':
+        if not HAS_TOMLLIB:
+            raise RuntimeError("TOML config files need Python 3.11+ (tomllib)")
+        return tomllib.load(stream)
+    return _yaml_load(stream)
+
+
 # Default configuration values
 DEFAULT_CONFIG = {
     'general': {
@@ -53,7 +98,9 @@ DEFAULT_CONFIG = {
         'cache_models': True,
         'worker_threads': 2,
         'batch_size': 1,
-        'analysis_timeout': 30
+        'analysis_timeout': 30,
+        'write_batch_size': 20,
+        'write_flush_interval': 600
     },
     'content_categories': {
         'productive': ['coding', 'programming', 'reading_documentation', 'professional_networking', 'learning', 'writing', 'spreadsheet', 'presentation', 'email_work', 'research', 'design_work'],
@@ -126,8 +173,24 @@ DEFAULT_CONFIG = {
     }
 }
 
+# Serialized once; load() clones the defaults with a single pickle.loads
+_DEFAULT_PICKLE = pickle.dumps(DEFAULT_CONFIG, pickle.HIGHEST_PROTOCOL)
+
+# Read-only view served by Config until something is merged or set
+_DEFAULT_VIEW = types.MappingProxyType(DEFAULT_CONFIG)
+
+# Shared default for missing content categories
+_EMPTY_LIST = ()
+
+# Marks a missing key in Config lookups (None is a valid value)
+_MISSING = object()
+
+
+# Slotted dataclasses need Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class MonitoringConfig:
     """Monitoring configuration."""
     screenshot_interval: int = 30
@@ -136,10 +199,10 @@ class MonitoringConfig:
     save_screenshots: bool = False
     max_screenshots: int = 1000
     screenshot_quality: int = 85
-    monitors: list = field(default_factory=list)
+    monitors: tuple = ()
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DetectionConfig:
     """Detection configuration."""
     use_clip: bool = True
@@ -158,7 +221,7 @@ class DetectionConfig:
     min_text_length: int = 10
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PerformanceConfig:
     """Performance configuration."""
     enable_gpu: bool = False
@@ -167,20 +230,22 @@ class PerformanceConfig:
     worker_threads: int = 2
     batch_size: int = 1
     analysis_timeout: int = 30
+    write_batch_size: int = 20
+    write_flush_interval: int = 600
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PrivacyConfig:
     """Privacy configuration."""
     store_screenshots: bool = False
     store_nsfw_details: bool = False
     anonymize_urls: bool = False
-    excluded_apps: list = field(default_factory=list)
-    excluded_title_keywords: list = field(default_factory=list)
+    excluded_apps: tuple = ()
+    excluded_title_keywords: tuple = ()
     data_retention_days: int = 90
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NotificationsConfig:
     """Notifications configuration."""
     enabled: bool = True
@@ -196,26 +261,119 @@ class NotificationsConfig:
     quiet_hours_end: str = '08:00'
 
 
-class Config:
+# notifications.quiet_hours keys -> flat NotificationsConfig fields
+_QUIET_HOURS_FIELDS = {
+    'enabled': 'quiet_hours_enabled',
+    'start': 'quiet_hours_start',
+    'end': 'quiet_hours_end',
+}
+
+
+def _intern_strings(config: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Configuration manager with lazy loading and caching.
+    Intern dict keys and list items of a freshly parsed config in place.
+    
+    YAML hands back new string objects; interned ones hash once and compare
+    by identity against the literals used throughout the code.
     """
+    stack = [config]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            items = list(node.items())
+            node.clear()
+            for key, value in items:
+                if type(key) is str:
+                    key = sys.intern(key)
+                node[key] = value
+                if type(value) in (dict, list):
+                    stack.append(value)
+        else:
+            for index, value in enumerate(node):
+                if type(value) is str:
+                    node[index] = sys.intern(value)
+                elif type(value) in (dict, list):
+                    stack.append(value)
+    return config
+
+
+def _substring_pattern(keywords) -> Optional[re.Pattern]:
+    """Compile keywords into one case-insensitive substring matcher (None if empty)."""
+    if not keywords:
+        return None
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+class _ConfigView(Mapping):
+    """
+    Read-only view over a config dict.
+    
+    Nested sections are wrapped as they are accessed and lists come back
+    as tuples, so nothing is copied up front.
+    """
+    
+    __slots__ = ('_data',)
+    
+    def __init__(self, data: Mapping[str, Any]):
+        self._data = data
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self._data[key]
+        if isinstance(value, dict):
+            return _ConfigView(value)
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+    
+    def __iter__(self):
+        return iter(self._data)
     
-    _instance: Optional['Config'] = None
-    _config: Dict[str, Any] = {}
-    _config_path: str = 'config.yaml'
-    _loaded: bool = False
+    def __len__(self) -> int:
+        return len(self._data)
     
-    def __new__(cls):
-        """Singleton pattern."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    def __repr__(self) -> str:
+        return f"_ConfigView({self._data!r})"
+
+
+def _cached_section(builder):
+    """
+    Property decorator caching a typed config section in Config._typed_cache.
     
-    def __init__(self):
-        """Initialize config (only loads once due to singleton)."""
-        if not self._loaded:
-            self.load()
+    The cache is cleared whenever the underlying config changes.
+    """
+    name = builder.__name__
+    
+    @wraps(builder)
+    def getter(self):
+        # Capture the cache before the builder reads _config (see load())
+        cache = self._typed_cache
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = builder(self)
+            return value
+    
+    return property(getter)
+
+
+class Config:
+    """
+    Configuration manager with lazy loading and caching.
+    """
+    
+    def __init__(self, config_path: str = None):
+        """
+        Initialize and load config.
+        
+        The shared instance is created once at import (see get_config()).
+        
+        Args:
+            config_path: Path to config file. If None, uses default locations.
+        """
+        self._config_path = 'config.yaml'
+        self._loaded = False
+        self._loaded_path: Optional[str] = None
+        self.load(config_path)
     
     def load(self, config_path: str = None) -> Dict[str, Any]:
         """
@@ -225,61 +383,98 @@ class Config:
             config_path: Path to config file. If None, uses default locations.
         
         Returns:
-            Loaded configuration dictionary.
+            Loaded configuration dictionary (a read-only view of the
+            defaults if no file overrides them).
         """
         if config_path:
             self._config_path = config_path
         
-        # Start with default config
-        self._config = self._deep_copy(DEFAULT_CONFIG)
+        # Build the new config locally: other threads keep reading the
+        # current one (e.g. during a SIGHUP reload) until it is swapped in.
+        # The frozen defaults are only cloned if a file overrides them.
+        config = _DEFAULT_VIEW
         
-        # Try to find and load config file
-        config_paths = [
-            self._config_path,
-            'config.yaml',
-            'config.yml',
-            os.path.expanduser('~/.config/content-tracker/config.yaml'),
-            '/etc/content-tracker/config.yaml'
-        ]
+        # An explicit path is the only candidate; otherwise probe the
+        # default locations in order
+        if config_path:
+            config_paths = [config_path]
+        else:
+            config_paths = list(dict.fromkeys([
+                self._config_path,
+                'config.yaml',
+                'config.yml',
+                'config.json',
+                'config.toml',
+                os.path.expanduser('~/.config/content-tracker/config.yaml'),
+                '/etc/content-tracker/config.yaml'
+            ]))
         
         loaded_path = None
         for path in config_paths:
-            if os.path.exists(path):
-                try:
-                    with open(path, 'r') as f:
-                        user_config = yaml.safe_load(f) or {}
-                    self._merge_config(self._config, user_config)
-                    loaded_path = path
-                    break
-                except Exception as e:
-                    logger.warning(f"Failed to load config from {path}: {e}")
+            try:
+                # Opening directly is the only syscall for a missing file;
+                # bytes let libyaml detect and decode the encoding itself
+                with open(path, 'rb') as f:
+                    user_config = _intern_strings(_parse_config(path, f) or {})
+                if user_config:
+                    config = _intern_strings(pickle.loads(_DEFAULT_PICKLE))
+                    self._merge_config(config, user_config)
+                loaded_path = path
+                break
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning(f"Failed to load config from {path}: {e}")
+        
+        # Swap the config in before the fresh caches. Readers capture a
+        # cache before reading _config, so anything they derive from the
+        # old config can only land in a cache that is being discarded.
+        self._config = config
+        self._typed_cache = {}
+        self._get_cache = {}
         
+        self._loaded_path = loaded_path
         if loaded_path:
             logger.info(f"Configuration loaded from: {loaded_path}")
         else:
             logger.info("Using default configuration (no config file found)")
         
         self._loaded = True
+        if config is _DEFAULT_VIEW:
+            # Don't expose DEFAULT_CONFIG's nested dicts and lists
+            return _ConfigView(DEFAULT_CONFIG)
+        return config
+    
+    def _writable(self) -> Dict[str, Any]:
+        """Return the config dict, cloning the frozen defaults on first write."""
+        if self._config is _DEFAULT_VIEW:
+            # Unpickled strings are new objects; re-intern them once
+            self._config = _intern_strings(pickle.loads(_DEFAULT_PICKLE))
         return self._config
     
     def _deep_copy(self, obj: Any) -> Any:
         """Deep copy a nested dictionary/list structure."""
-        if isinstance(obj, dict):
-            return {k: self._deep_copy(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._deep_copy(item) for item in obj]
-        else:
-            return obj
+        # A pickle round trip copies in C instead of recursing in Python
+        try:
+            return pickle.loads(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return copy.deepcopy(obj)
     
     def _merge_config(self, base: Dict, override: Dict):
         """
-        Recursively merge override config into base config.
+        Merge override config into base config in place.
+        
+        Walks nested sections with an explicit stack rather than recursion.
         """
-        for key, value in override.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._merge_config(base[key], value)
-            else:
-                base[key] = value
+        stack = [(base, override)]
+        while stack:
+            base, override = stack.pop()
+            for key, value in override.items():
+                current = base.get(key)
+                if type(current) is dict and type(value) is dict:
+                    stack.append((current, value))
+                else:
+                    base[key] = value
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -292,15 +487,35 @@ class Config:
         Returns:
             Configuration value or default.
         """
-        keys = key.split('.')
-        value = self._config
+        # Capture the cache before reading _config (see load())
+        cache = self._get_cache
+        try:
+            return cache[key]
+        except KeyError:
+            pass
         
+        value = self._lookup(key)
+        if value is _MISSING:
+            return default
+        
+        if isinstance(value, (dict, list)) and self._config is _DEFAULT_VIEW:
+            # Callers may mutate what they get back; hand out this
+            # instance's own copy, never DEFAULT_CONFIG's containers
+            self._writable()
+            value = self._lookup(key)
+        
+        cache[key] = value
+        return value
+    
+    def _lookup(self, key: str, default: Any = _MISSING) -> Any:
+        """Resolve a dot-notation key without caching or copying (read-only use)."""
+        value = self._config
         try:
-            for k in keys:
+            for k in key.split('.'):
                 value = value[k]
-            return value
         except (KeyError, TypeError):
             return default
+        return value
     
     def set(self, key: str, value: Any):
         """
@@ -311,7 +526,7 @@ class Config:
             value: Value to set
         """
         keys = key.split('.')
-        config = self._config
+        config = self._writable()
         
         for k in keys[:-1]:
             if k not in config:
@@ -319,35 +534,46 @@ class Config:
             config = config[k]
         
         config[keys[-1]] = value
+        
+        # Fresh caches, assigned after the change (see load())
+        self._typed_cache = {}
+        self._get_cache = {}
     
     def save(self, config_path: str = None):
         """
-        Save current configuration to YAML file.
+        Save current configuration to YAML (or JSON, by extension) file.
         
         Args:
             config_path: Path to save config. If None, uses loaded path.
         """
         path = config_path or self._config_path
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.toml':
+            raise ValueError("Saving TOML config is not supported; use .yaml or .json")
         
         # Ensure directory exists
-        os.makedirs(os.path.dirname(path) if os.path.dirname(path) else '.', exist_ok=True)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
         
         with open(path, 'w') as f:
-            yaml.dump(self._config, f, default_flow_style=False, sort_keys=False)
+            if ext == '.json':
+                json.dump(self._writable(), f, indent=2)
+            else:
+                _yaml_dump(self._writable(), f)
         
         logger.info(f"Configuration saved to: {path}")
     
     def reload(self):
         """Reload configuration from file."""
         self._loaded = False
-        self.load()
+        # Go straight back to the file found last time
+        self.load(self._loaded_path)
     
     # ==================== Typed Config Accessors ====================
     
-    @property
+    @_cached_section
     def monitoring(self) -> MonitoringConfig:
         """Get monitoring configuration."""
-        cfg = self.get('monitoring', {})
+        cfg = self._lookup('monitoring', {})
         return MonitoringConfig(
             screenshot_interval=cfg.get('screenshot_interval', 30),
             same_window_recheck=cfg.get('same_window_recheck', 30),
@@ -355,13 +581,13 @@ class Config:
             save_screenshots=cfg.get('save_screenshots', False),
             max_screenshots=cfg.get('max_screenshots', 1000),
             screenshot_quality=cfg.get('screenshot_quality', 85),
-            monitors=cfg.get('monitors', [])
+            monitors=tuple(cfg.get('monitors') or ())
         )
     
-    @property
+    @_cached_section
     def detection(self) -> DetectionConfig:
         """Get detection configuration."""
-        cfg = self.get('detection', {})
+        cfg = self._lookup('detection', {})
         return DetectionConfig(
             use_clip=cfg.get('use_clip', True),
             use_nudenet=cfg.get('use_nudenet', True),
@@ -379,50 +605,44 @@ class Config:
             min_text_length=cfg.get('min_text_length', 10)
         )
     
-    @property
+    @_cached_section
     def performance(self) -> PerformanceConfig:
         """Get performance configuration."""
-        cfg = self.get('performance', {})
+        cfg = self._lookup('performance', {})
         return PerformanceConfig(
             enable_gpu=cfg.get('enable_gpu', False),
             max_memory_mb=cfg.get('max_memory_mb', 2048),
             cache_models=cfg.get('cache_models', True),
             worker_threads=cfg.get('worker_threads', 2),
             batch_size=cfg.get('batch_size', 1),
-            analysis_timeout=cfg.get('analysis_timeout', 30)
+            analysis_timeout=cfg.get('analysis_timeout', 30),
+            write_batch_size=cfg.get('write_batch_size', 20),
+            write_flush_interval=cfg.get('write_flush_interval', 600)
         )
     
-    @property
+    @_cached_section
     def privacy(self) -> PrivacyConfig:
         """Get privacy configuration."""
-        cfg = self.get('privacy', {})
+        cfg = self._lookup('privacy', {})
         return PrivacyConfig(
             store_screenshots=cfg.get('store_screenshots', False),
             store_nsfw_details=cfg.get('store_nsfw_details', False),
             anonymize_urls=cfg.get('anonymize_urls', False),
-            excluded_apps=cfg.get('excluded_apps', []),
-            excluded_title_keywords=cfg.get('excluded_title_keywords', []),
+            excluded_apps=tuple(cfg.get('excluded_apps') or ()),
+            excluded_title_keywords=tuple(cfg.get('excluded_title_keywords') or ()),
             data_retention_days=cfg.get('data_retention_days', 90)
         )
     
-    @property
+    @_cached_section
     def notifications(self) -> NotificationsConfig:
         """Get notifications configuration."""
-        cfg = self.get('notifications', {})
-        quiet = cfg.get('quiet_hours', {})
-        return NotificationsConfig(
-            enabled=cfg.get('enabled', True),
-            distraction_alerts=cfg.get('distraction_alerts', True),
-            productivity_updates=cfg.get('productivity_updates', True),
-            daily_summary=cfg.get('daily_summary', True),
-            nsfw_alerts=cfg.get('nsfw_alerts', True),
-            distraction_threshold=cfg.get('distraction_threshold', 1800),
-            productivity_update_interval=cfg.get('productivity_update_interval', 3600),
-            daily_summary_time=cfg.get('daily_summary_time', '21:00'),
-            quiet_hours_enabled=quiet.get('enabled', False),
-            quiet_hours_start=quiet.get('start', '22:00'),
-            quiet_hours_end=quiet.get('end', '08:00')
-        )
+        cfg = self._lookup('notifications', {})
+        quiet = cfg.get('quiet_hours') or {}
+        
+        # Only configured keys are passed; the dataclass supplies defaults
+        values = {name: cfg[name] for name in NotificationsConfig.__dataclass_fields__ if name in cfg}
+        values.update({name: quiet[key] for key, name in _QUIET_HOURS_FIELDS.items() if key in quiet})
+        return NotificationsConfig(**values)
     
     @property
     def debug(self) -> bool:
@@ -439,24 +659,68 @@ class Config:
         """Get database path."""
         return self.get('database.path', 'data/activity.db')
     
-    def get_content_categories(self, category: str) -> list:
-        """Get list of content types for a category."""
-        return self.get(f'content_categories.{category}', [])
+    @_cached_section
+    def _content_categories(self) -> Dict[str, tuple]:
+        """content_categories section with each list frozen as a tuple."""
+        categories = self._lookup('content_categories', {})
+        if not isinstance(categories, Mapping):
+            return {}
+        return {category: tuple(items or ()) for category, items in categories.items()}
+    
+    @_cached_section
+    def _category_index(self) -> Dict[str, str]:
+        """Reverse index of content type -> category (first listed wins)."""
+        index = {}
+        for category, items in self._content_categories.items():
+            for item in items:
+                index.setdefault(item, category)
+        return index
+    
+    @_cached_section
+    def _scoring_weights(self) -> Dict[str, float]:
+        """scoring.weights section, resolved once per load."""
+        weights = self._lookup('scoring.weights', {})
+        return weights if isinstance(weights, Mapping) else {}
+    
+    def get_content_categories(self, category: str) -> tuple:
+        """Get the content types listed under a category."""
+        return self._content_categories.get(category, _EMPTY_LIST)
+    
+    def category_of(self, content_type: str) -> Optional[str]:
+        """
+        Get the category a content type is listed under.
+        
+        Args:
+            content_type: Content type, e.g. 'tutorial'
+        
+        Returns:
+            Category name, or None if it is not listed
+        """
+        return self._category_index.get(content_type)
     
     def get_scoring_weight(self, activity_type: str) -> float:
         """Get productivity scoring weight for an activity type."""
-        return self.get(f'scoring.weights.{activity_type}', 0.0)
+        return self._scoring_weights.get(activity_type, 0.0)
+    
+    @_cached_section
+    def _excluded_apps_pattern(self) -> Optional[re.Pattern]:
+        """Case-insensitive alternation of the excluded app names."""
+        return _substring_pattern(self.privacy.excluded_apps)
+    
+    @_cached_section
+    def _excluded_titles_pattern(self) -> Optional[re.Pattern]:
+        """Case-insensitive alternation of the excluded title keywords."""
+        return _substring_pattern(self.privacy.excluded_title_keywords)
     
     def is_app_excluded(self, app_name: str) -> bool:
         """Check if an app is excluded from tracking."""
-        excluded = self.privacy.excluded_apps
-        return any(exc.lower() in app_name.lower() for exc in excluded)
+        pattern = self._excluded_apps_pattern
+        return pattern is not None and pattern.search(app_name) is not None
     
     def is_title_excluded(self, title: str) -> bool:
         """Check if a window title contains excluded keywords."""
-        keywords = self.privacy.excluded_title_keywords
-        title_lower = title.lower()
-        return any(kw.lower() in title_lower for kw in keywords)
+        pattern = self._excluded_titles_pattern
+        return pattern is not None and pattern.search(title) is not None
     
     def __getitem__(self, key: str) -> Any:
         """Allow dictionary-style access."""
@@ -464,29 +728,42 @@ class Config:
     
     def __contains__(self, key: str) -> bool:
         """Check if key exists."""
-        return self.get(key) is not None
+        cache = self._get_cache
+        try:
+            return cache[key] is not None
+        except KeyError:
+            pass
+        
+        # Walk only as far as needed; misses stop early without raising
+        value = self._config
+        for k in key.split('.'):
+            if not isinstance(value, Mapping) or k not in value:
+                return False
+            value = value[k]
+        return value is not None
+    
+    def to_view(self) -> Mapping[str, Any]:
+        """Return a read-only view of the configuration without copying it."""
+        return _ConfigView(self._config)
     
     def to_dict(self) -> Dict[str, Any]:
         """Return full configuration as dictionary."""
+        if self._config is _DEFAULT_VIEW:
+            return pickle.loads(_DEFAULT_PICKLE)
         return self._deep_copy(self._config)
 
 
-# Global config instance
-_config: Optional[Config] = None
+# Global config instance, loaded at import
+_config = Config()
 
 
 def get_config() -> Config:
     """Get the global configuration instance."""
-    global _config
-    if _config is None:
-        _config = Config()
     return _config
 
 
 def load_config(config_path: str = None) -> Config:
     """Load configuration from specified path."""
-    global _config
-    _config = Config()
     if config_path:
         _config.load(config_path)
     return _config
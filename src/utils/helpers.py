@@ -6,23 +6,54 @@ Common utility functions used throughout the application.
 import os
 import re
 import hashlib
+import shutil
 import time
 import subprocess
 import platform
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time as dt_time
 from typing import Optional, List, Dict, Any, Tuple, Callable
 from urllib.parse import urlparse, parse_qs
-from functools import wraps
+from functools import wraps, lru_cache
+from collections import OrderedDict
 from pathlib import Path
 import logging
 import json
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for the URL and text helpers below
+_YOUTUBE_ID_RE = re.compile(r'(?:youtube\.com/(?:watch\?v=|embed/|shorts/)|youtu\.be/)([a-zA-Z0-9_-]{11})')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NETLOC_END_RE = re.compile(r'[/?#]')
+_URL_SLOW_PATH_RE = re.compile(r'[\[\]\t\r\n]')
+_STOPWORDS = (
+    'the', 'and', 'for', 'are', 'but', 'not', 'you',
+    'all', 'can', 'her', 'was', 'one', 'our', 'out',
+)
+# Runs of invalid filename characters, whitespace and underscores
+_FILENAME_UNSAFE_RUN_RE = re.compile(r'[<>:"/\\|?*\s_]+')
+
+# str.translate() table deleting C0/C1 control characters except tab/newline
+_CONTROL_CHARS = dict.fromkeys(
+    [c for c in range(32) if c not in (9, 10)] + list(range(127, 160))
+)
+
 
 # ==================== URL Utilities ====================
 
+# URLs repeat heavily within a browsing session, so the pure URL helpers
+# below are memoized. Call clear_url_caches() to drop any retained URLs.
+_URL_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_URL_CACHE_SIZE)
 def extract_domain(url: str) -> str:
     """
     Extract domain from URL.
@@ -37,12 +68,19 @@ def extract_domain(url: str) -> str:
         return ''
     
     try:
-        # Add scheme if missing
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
+        if url.startswith('https://'):
+            rest = url[8:]
+        elif url.startswith('http://'):
+            rest = url[7:]
+        else:
+            rest = url
         
-        parsed = urlparse(url)
-        domain = parsed.netloc
+        if rest.isascii() and not _URL_SLOW_PATH_RE.search(rest):
+            # Plain host: the netloc runs up to the first '/', '?' or '#'
+            domain = _NETLOC_END_RE.split(rest, 1)[0]
+        else:
+            # IPv6 literals, embedded tabs/newlines, non-ASCII hosts
+            domain = urlparse('https://' + rest).netloc
         
         # Remove www. prefix
         if domain.startswith('www.'):
@@ -67,17 +105,8 @@ def extract_youtube_video_id(url: str) -> Optional[str]:
     Returns:
         Video ID or None
     """
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/shorts\/([a-zA-Z0-9_-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    
-    return None
+    match = _YOUTUBE_ID_RE.search(url)
+    return match.group(1) if match else None
 
 
 def get_url_path(url: str) -> str:
@@ -98,19 +127,30 @@ def get_url_path(url: str) -> str:
         return ''
 
 
-def hash_url(url: str) -> str:
+@lru_cache(maxsize=_URL_CACHE_SIZE)
+def hash_url(url: str, algorithm: str = 'sha256') -> str:
     """
     Create a hash of a URL for anonymization.
     
     Args:
         url: URL to hash
+        algorithm: 'sha256' (default, matches existing tags) or 'blake2b'
+            (faster, but produces different tags)
     
     Returns:
-        SHA256 hash of URL
+        16-character hex hash of URL
     """
+    if algorithm == 'blake2b':
+        return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
     return hashlib.sha256(url.encode()).hexdigest()[:16]
 
 
+def clear_url_caches() -> None:
+    """Forget all URLs memoized by extract_domain() and hash_url()."""
+    extract_domain.cache_clear()
+    hash_url.cache_clear()
+
+
 # ==================== Text Utilities ====================
 
 def clean_text(text: str) -> str:
@@ -127,10 +167,15 @@ def clean_text(text: str) -> str:
         return ''
     
     # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     
-    # Remove non-printable characters
-    text = ''.join(char for char in text if char.isprintable() or char in '\n\t')
+    # Remove non-printable characters. Whitespace is already collapsed to
+    # spaces, so usually only C0/C1 controls remain and translate() drops
+    # them; other non-printables (format, unassigned) take the slow path.
+    if not text.isprintable():
+        text = text.translate(_CONTROL_CHARS)
+        if not text.isprintable():
+            text = ''.join(char for char in text if char.isprintable() or char in '\n\t')
     
     return text.strip()
 
@@ -149,14 +194,17 @@ def extract_keywords(text: str, min_length: int = 3) -> List[str]:
     if not text:
         return []
     
-    # Convert to lowercase and split
-    words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
-    
-    # Filter by length and remove common words
-    stopwords = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'her', 'was', 'one', 'our', 'out'}
-    keywords = [w for w in words if len(w) >= min_length and w not in stopwords]
-    
-    return list(set(keywords))
+    # Length and stopword filtering happen inside the regex; only the
+    # dedupe is left to Python
+    return list(set(_keyword_word_pattern(min_length).findall(text.lower())))
+
+
+@lru_cache(maxsize=8)
+def _keyword_word_pattern(min_length: int) -> re.Pattern:
+    """Build the word regex for extract_keywords, skipping stopwords."""
+    return re.compile(
+        r'\b(?!(?:%s)\b)[a-zA-Z]{%d,}\b' % ('|'.join(_STOPWORDS), max(min_length, 1))
+    )
 
 
 def truncate_text(text: str, max_length: int = 100, suffix: str = '...') -> str:
@@ -187,10 +235,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Safe filename
     """
-    # Remove or replace invalid characters
-    safe = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    safe = re.sub(r'\s+', '_', safe)
-    safe = re.sub(r'_+', '_', safe)
+    # Replace each run of invalid characters/whitespace with one underscore
+    safe = _FILENAME_UNSAFE_RUN_RE.sub('_', filename)
     return safe.strip('_')[:255]
 
 
@@ -209,11 +255,14 @@ def contains_keywords(text: str, keywords: List[str], case_sensitive: bool = Fal
     if not text or not keywords:
         return False
     
-    if not case_sensitive:
-        text = text.lower()
-        keywords = [k.lower() for k in keywords]
-    
-    return any(kw in text for kw in keywords)
+    return _keyword_pattern(tuple(keywords), case_sensitive).search(text) is not None
+
+
+@lru_cache(maxsize=128)
+def _keyword_pattern(keywords: Tuple[str, ...], case_sensitive: bool) -> re.Pattern:
+    """Compile keywords into one alternation so text is scanned once."""
+    alternation = '|'.join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+    return re.compile(alternation, 0 if case_sensitive else re.IGNORECASE)
 
 
 # ==================== Time Utilities ====================
@@ -305,8 +354,8 @@ def is_within_hours(start_time: str, end_time: str) -> bool:
         True if current time is within range
     """
     now = datetime.now().time()
-    start = datetime.strptime(start_time, '%H:%M').time()
-    end = datetime.strptime(end_time, '%H:%M').time()
+    start = _parse_hhmm(start_time)
+    end = _parse_hhmm(end_time)
     
     if start <= end:
         return start <= now <= end
@@ -315,6 +364,13 @@ def is_within_hours(start_time: str, end_time: str) -> bool:
         return now >= start or now <= end
 
 
+@lru_cache(maxsize=32)
+def _parse_hhmm(value: str) -> dt_time:
+    """Parse an 'HH:MM' string once; schedules reuse the same few values."""
+    hour, minute = value.split(':')
+    return dt_time(int(hour), int(minute))
+
+
 # ==================== System Utilities ====================
 
 def get_system_info() -> Dict[str, str]:
@@ -324,6 +380,12 @@ def get_system_info() -> Dict[str, str]:
     Returns:
         Dictionary with system info
     """
+    return _system_info().copy()
+
+
+@lru_cache(maxsize=1)
+def _system_info() -> Dict[str, str]:
+    """Query the platform once; the values can't change while running."""
     return {
         'os': platform.system(),
         'os_release': platform.release(),
@@ -380,6 +442,7 @@ def run_command(command: List[str], timeout: int = 10) -> Tuple[str, str, int]:
         return '', str(e), -1
 
 
+@lru_cache(maxsize=128)
 def check_command_exists(command: str) -> bool:
     """
     Check if a command exists on the system.
@@ -390,15 +453,8 @@ def check_command_exists(command: str) -> bool:
     Returns:
         True if command exists
     """
-    try:
-        subprocess.run(
-            ['which', command],
-            capture_output=True,
-            check=True
-        )
-        return True
-    except subprocess.CalledProcessError:
-        return False
+    # Installed commands don't change during a run, hence the cache
+    return shutil.which(command) is not None
 
 
 def get_memory_usage() -> Dict[str, int]:
@@ -422,6 +478,8 @@ def get_memory_usage() -> Dict[str, int]:
 
 # ==================== File Utilities ====================
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 def ensure_dir(path: str) -> str:
     """
     Ensure directory exists, create if not.
@@ -433,7 +491,11 @@ def ensure_dir(path: str) -> str:
         Absolute path
     """
     abs_path = os.path.abspath(path)
-    os.makedirs(abs_path, exist_ok=True)
+    # One stat when the directory exists (the common case) instead of a
+    # failing mkdir plus stat; checked every call so a directory removed
+    # while running is recreated
+    if not os.path.isdir(abs_path):
+        os.makedirs(abs_path, exist_ok=True)
     return abs_path
 
 
@@ -453,6 +515,35 @@ def get_file_size(path: str) -> int:
         return 0
 
 
+def get_dir_file_sizes(path: str) -> Dict[str, int]:
+    """
+    Get the sizes of all regular files in a directory.
+    
+    Uses os.scandir so each size comes from a single stat per entry
+    instead of a separate listdir + getsize round trip.
+    
+    Args:
+        path: Directory path
+    
+    Returns:
+        Dictionary mapping file name to size in bytes, empty if the
+        directory does not exist
+    """
+    sizes = {}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        sizes[entry.name] = entry.stat().st_size
+                except OSError:
+                    # Removed between readdir and stat
+                    continue
+    except OSError:
+        pass
+    return sizes
+
+
 def format_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
@@ -463,11 +554,11 @@ def format_size(size_bytes: int) -> str:
     Returns:
         Formatted string
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f} TB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Each unit is 2**10 larger, so the bit length picks it directly
+    unit = min((int(size_bytes).bit_length() - 1) // 10, 4)
+    return f"{size_bytes / (1 << (unit * 10)):.1f} {_SIZE_UNITS[unit]}"
 
 
 # ==================== Decorators ====================
@@ -478,10 +569,13 @@ def timing(func: Callable) -> Callable:
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
+        # Checked per call so runtime log level changes still apply
+        if not logger.isEnabledFor(logging.DEBUG):
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        duration = (time.time() - start) * 1000
-        logger.debug(f"{func.__name__} took {duration:.2f}ms")
+        duration = (time.perf_counter_ns() - start) / 1e6
+        logger.debug("%s took %.2fms", func.__name__, duration)
         return result
     return wrapper
 
@@ -521,25 +615,49 @@ def singleton(cls):
     return get_instance
 
 
-def cached(ttl_seconds: int = 300):
+_KWARGS_MARK = object()
+
+
+def cached(ttl_seconds: int = 300, maxsize: int = 256):
     """
     Decorator to cache function results.
+    
+    Entries expire after ttl_seconds; at most maxsize entries are kept,
+    evicting the least recently used.
     """
     def decorator(func: Callable) -> Callable:
-        cache = {}
+        cache = OrderedDict()
         
         @wraps(func)
         def wrapper(*args, **kwargs):
-            key = str(args) + str(kwargs)
+            key = args
+            if kwargs:
+                items = tuple(sorted(kwargs.items()))
+                key += (_KWARGS_MARK,) + items
+            # Include argument types, as lru_cache(typed=True) does, so
+            # f(1), f(1.0) and f(True) don't share an entry
+            key += tuple(type(a) for a in args)
+            if kwargs:
+                key += tuple(type(v) for _, v in items)
+            try:
+                hash(key)
+            except TypeError:
+                # Unhashable arguments: fall back to a string key
+                key = str(args) + str(kwargs)
             now = time.time()
             
-            if key in cache:
-                result, timestamp = cache[key]
+            entry = cache.get(key)
+            if entry is not None:
+                result, timestamp = entry
                 if now - timestamp < ttl_seconds:
+                    cache.move_to_end(key)
                     return result
             
             result = func(*args, **kwargs)
             cache[key] = (result, now)
+            cache.move_to_end(key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
             return result
         
         wrapper.clear_cache = lambda: cache.clear()
@@ -561,6 +679,12 @@ def safe_json_loads(data: str, default: Any = None) -> Any:
     Returns:
         Parsed data or default
     """
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except (ValueError, TypeError):
+            # orjson is stricter (e.g. NaN); let the stdlib decide
+            pass
     try:
         return json.loads(data)
     except (json.JSONDecodeError, TypeError):
@@ -578,6 +702,12 @@ def safe_json_dumps(data: Any, default: str = '{}') -> str:
     Returns:
         JSON string or default
     """
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except (TypeError, ValueError):
+            # orjson rejects some inputs the stdlib accepts (e.g. big ints)
+            pass
     try:
         return json.dumps(data)
     except (TypeError, ValueError):
@@ -596,11 +726,17 @@ def merge_dicts(base: Dict, override: Dict) -> Dict:
         Merged dictionary
     """
     result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_dicts(result[key], value)
-        else:
-            result[key] = value
+    stack = [(result, override)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                # Copy only the subtrees that are actually overridden
+                current = target[key] = current.copy()
+                stack.append((current, value))
+            else:
+                target[key] = value
     return result
 
 
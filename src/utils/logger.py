@@ -5,10 +5,18 @@ Configures logging with colored output and file rotation.
 
 import os
 import sys
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from contextlib import contextmanager
+from logging.handlers import (
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+    QueueHandler,
+    QueueListener,
+)
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 
 # Try to import colorlog for colored console output
@@ -53,6 +61,9 @@ class LoggerManager:
     _level: int = logging.INFO
     _use_color: bool = True
     _use_rich: bool = False
+    _listeners: List[QueueListener] = []
+    _root_listener: Optional[QueueListener] = None
+    _activity_listener: Optional[QueueListener] = None
     
     @classmethod
     def setup(
@@ -65,7 +76,8 @@ class LoggerManager:
         max_file_size: int = 10 * 1024 * 1024,  # 10 MB
         backup_count: int = 5,
         log_to_console: bool = True,
-        log_to_file: bool = True
+        log_to_file: bool = True,
+        use_queue: bool = True
     ):
         """
         Set up logging configuration.
@@ -80,6 +92,8 @@ class LoggerManager:
             backup_count: Number of backup files to keep
             log_to_console: Enable console logging
             log_to_file: Enable file logging
+            use_queue: Format and write records on a background thread so
+                logging callers only pay for an enqueue
         """
         if cls._initialized:
             return
@@ -100,15 +114,22 @@ class LoggerManager:
         # Remove existing handlers
         root_logger.handlers = []
         
+        handlers = []
+        
         # Add console handler
         if log_to_console:
-            console_handler = cls._create_console_handler()
-            root_logger.addHandler(console_handler)
+            handlers.append(cls._create_console_handler())
         
         # Add file handler
         if log_to_file:
-            file_handler = cls._create_file_handler(max_file_size, backup_count)
-            root_logger.addHandler(file_handler)
+            handlers.append(cls._create_file_handler(max_file_size, backup_count))
+        
+        if use_queue and handlers:
+            queue_handler, cls._root_listener = cls._start_listener(handlers)
+            root_logger.addHandler(queue_handler)
+        else:
+            for handler in handlers:
+                root_logger.addHandler(handler)
         
         # Set levels for noisy libraries
         logging.getLogger('PIL').setLevel(logging.WARNING)
@@ -122,6 +143,59 @@ class LoggerManager:
         logger = logging.getLogger(__name__)
         logger.info(f"Logging initialized - Level: {level}, Dir: {log_dir}")
     
+    @classmethod
+    def _start_listener(cls, handlers: List[logging.Handler]):
+        """
+        Route records through a queue to handlers on a background thread.
+        
+        Args:
+            handlers: Handlers doing the actual formatting and I/O
+        
+        Returns:
+            Tuple of (QueueHandler to attach, running QueueListener)
+        """
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        
+        if not cls._listeners:
+            atexit.register(cls.shutdown)
+        cls._listeners.append(listener)
+        
+        return QueueHandler(log_queue), listener
+    
+    @classmethod
+    def shutdown(cls):
+        """Flush queued records and stop the background logging threads."""
+        while cls._listeners:
+            listener = cls._listeners.pop()
+            try:
+                listener.stop()
+            except Exception:
+                pass
+        cls._root_listener = None
+        cls._activity_listener = None
+    
+    @classmethod
+    @contextmanager
+    def _paused_root_listener(cls):
+        """
+        Drain the root queue and hold the listener while handlers change.
+        
+        Records queued before the change are written with the old handlers
+        and levels; records logged meanwhile wait in the queue.
+        """
+        listener = cls._root_listener
+        if listener is None:
+            yield
+            return
+        
+        listener.stop()
+        try:
+            yield
+        finally:
+            listener.start()
+    
     @classmethod
     def _create_console_handler(cls) -> logging.Handler:
         """Create console log handler with optional colors."""
@@ -198,8 +272,13 @@ class LoggerManager:
         root_logger = logging.getLogger()
         root_logger.setLevel(new_level)
         
-        for handler in root_logger.handlers:
-            handler.setLevel(new_level)
+        with cls._paused_root_listener():
+            for handler in root_logger.handlers:
+                handler.setLevel(new_level)
+            
+            if cls._root_listener is not None:
+                for handler in cls._root_listener.handlers:
+                    handler.setLevel(new_level)
     
     @classmethod
     def add_file_handler(cls, filename: str, level: str = None):
@@ -222,15 +301,30 @@ class LoggerManager:
         handler.setFormatter(logging.Formatter(DETAILED_FORMAT))
         handler.setLevel(handler_level)
         
-        logging.getLogger().addHandler(handler)
+        if cls._root_listener is not None:
+            # Only records logged from now on reach the new handler
+            with cls._paused_root_listener():
+                cls._root_listener.handlers += (handler,)
+        else:
+            logging.getLogger().addHandler(handler)
     
     @classmethod
     def create_activity_logger(cls) -> logging.Logger:
         """
         Create a separate logger for activity tracking.
         Logs to a dedicated file with less verbose format.
+        
+        The logger and its background writer are shared: later calls
+        return the already configured logger.
         """
         logger = logging.getLogger('activity_tracker')
+        if cls._activity_listener is not None:
+            return logger
+        
+        # Drop handlers left over from a listener stopped by shutdown()
+        for old_handler in list(logger.handlers):
+            logger.removeHandler(old_handler)
+        
         logger.setLevel(logging.INFO)
         
         # Don't propagate to root logger
@@ -251,7 +345,9 @@ class LoggerManager:
             datefmt='%Y-%m-%d %H:%M:%S'
         ))
         
-        logger.addHandler(handler)
+        # Activity events are the hottest log path; write them off-thread
+        queue_handler, cls._activity_listener = cls._start_listener([handler])
+        logger.addHandler(queue_handler)
         
         return logger
 
@@ -309,9 +405,8 @@ class ActivityLogger:
     ):
         """Log an activity event."""
         self._logger.info(
-            f"APP={app} | WINDOW={window[:50]} | "
-            f"TYPE={activity_type} | DESC={content_desc} | "
-            f"CONF={confidence:.2f}"
+            "APP=%s | WINDOW=%.50s | TYPE=%s | DESC=%s | CONF=%.2f",
+            app, window, activity_type, content_desc, confidence
         )
     
     def log_detection(
@@ -323,14 +418,14 @@ class ActivityLogger:
     ):
         """Log a detection result."""
         self._logger.info(
-            f"DETECTION | METHOD={method} | RESULT={result} | "
-            f"CONF={confidence:.2f} | TIME={duration_ms:.0f}ms"
+            "DETECTION | METHOD=%s | RESULT=%s | CONF=%.2f | TIME=%.0fms",
+            method, result, confidence, duration_ms
         )
     
     def log_error(self, error: str, context: str = ''):
         """Log an error event."""
-        self._logger.error(f"ERROR | {context} | {error}")
+        self._logger.error("ERROR | %s | %s", context, error)
     
     def log_event(self, event_type: str, details: str):
         """Log a general event."""
-        self._logger.info(f"EVENT | TYPE={event_type} | {details}")
+        self._logger.info("EVENT | TYPE=%s | %s", event_type, details)